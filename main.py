@@ -1,5 +1,24 @@
-import pandas as pd
-from src.pipeline import run_pipeline
+import argparse
+from src.pipeline import run_pipeline, PRODUCT_TABLES
+from src.load.load import migrate_database
 
 if __name__ == "__main__":
-    run_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pipeline ETL de preços de hardware")
+    parser.add_argument("--concurrent", action="store_true", help="Extrai todas as lojas ao mesmo tempo (asyncio)")
+    parser.add_argument("--lean", action="store_true", help="Bloqueia imagens, fontes e rastreadores durante a extração")
+    parser.add_argument("--http-first", action="store_true", help="Tenta extrair via HTTP antes de abrir o navegador")
+    parser.add_argument("--run-id", help="Identificador da execução no checkpoint (padrão: data de hoje)")
+    parser.add_argument("--fresh", action="store_true", help="Descarta o checkpoint e extrai todas as páginas de novo")
+    parser.add_argument("--workers", type=int, nargs="?", const=None, default=0,
+                        help="Extrai cada loja/categoria em um processo separado (N processos; sem N, um por CPU)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Transforma e grava cada página assim que ela é extraída (memória constante)")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Só cria/migra as tabelas do banco (esquema e índices), sem extrair")
+    args = parser.parse_args()
+
+    if args.migrate:
+        raise SystemExit(0 if migrate_database(PRODUCT_TABLES.values()) else 1)
+
+    run_pipeline(concurrent=args.concurrent, lean=args.lean, http_first=args.http_first,
+                 run_id=args.run_id, fresh=args.fresh, workers=args.workers, stream=args.stream)
@@ -0,0 +1,84 @@
+"""
+Backends de DataFrame (src/transform/backend.py) em um ano sintético de coletas diárias:
+normalização de preços e parcelas da transformação, junção com o índice de benchmarks e
+a melhor oferta de cada modelo (groupby + idxmin) do dashboard, com "pandas" e "arrow",
+checando que os resultados são idênticos.
+
+    python perf/bench_backends.py [--days 365] [--products 3000]
+"""
+import argparse
+import tempfile
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from perf.bench_schema import synthetic_history
+from perf.bench_prices import brl, MISSING_PRICES, MISSING_INSTALLMENTS
+from src.transform.backend import BACKENDS, add_price_columns, join_on_key, cheapest_per_key
+from src.transform.product_key import add_product_key, load_benchmark_index
+from src.transform.schema import apply_schema
+import pandas as pd
+import numpy as np
+
+
+def raw_prices(history: pd.DataFrame) -> pd.DataFrame:
+    """As colunas de preço do histórico como as lojas as escrevem (textos), com alguns itens sem preço."""
+    # Os textos são montados uma vez por preço distinto, como se repetem entre os dias
+    cash_codes, cash_values = pd.factorize(history["cash_price"])
+    cash = np.array([brl(value) for value in cash_values], dtype=object)[cash_codes]
+    parcel_codes, parcel_values = pd.factorize(history["installment_price"])
+    parcels = np.array([f"de {brl(value)}" for value in parcel_values], dtype=object)[parcel_codes]
+    installments = history["installments"].astype(str).to_numpy(dtype=object) + "x " + parcels
+
+    missing = np.flatnonzero(np.arange(len(history)) % 10 == 9)
+    cash[missing] = np.array(MISSING_PRICES, dtype=object)[missing % 3]
+    installments[missing] = np.array(MISSING_INSTALLMENTS, dtype=object)[missing % 3]
+    return pd.DataFrame({"cash_price": cash, "installments": installments, "installment_price": np.nan})
+
+
+def timed(func, repeat: int = 3) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def compare(name: str, steps: dict):
+    """Executa o mesmo passo em cada backend e confere que os DataFrames são iguais ao do pandas."""
+    times, results = {}, {}
+    for backend, func in steps.items():
+        times[backend], results[backend] = timed(func)
+    for backend in BACKENDS[1:]:
+        pd.testing.assert_frame_equal(results["pandas"], results[backend])
+    line = ", ".join(f"{backend} {seconds * 1000:.0f} ms" for backend, seconds in times.items())
+    print(f"  {name}: {line} ({times['pandas'] / times['arrow']:.1f}x), resultados idênticos")
+
+
+def run(days: int, products: int):
+    history = synthetic_history(days, products)
+    print(f"{len(history):,} linhas ({days} dias x {products} produtos)")
+
+    raw = raw_prices(history)
+    compare("preços e parcelas", {backend: (lambda b=backend: add_price_columns(raw.copy(), b)) for backend in BACKENDS})
+
+    offers = add_product_key(apply_schema(history), "CPU")
+    offers["product_key"] = offers["product_key"].astype(object)
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmarks = load_benchmark_index("CPU", os.path.join(tmp, "benchmark_index.csv"))
+    compare("junção com benchmarks", {backend: (lambda b=backend: join_on_key(offers, benchmarks, "product_key", b))
+                                      for backend in BACKENDS})
+
+    joined = join_on_key(offers, benchmarks, "product_key")
+    compare("melhor oferta por modelo", {backend: (lambda b=backend: cheapest_per_key(joined, "product_key", "cash_price", b))
+                                         for backend in BACKENDS})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--products", type=int, default=3000)
+    args = parser.parse_args()
+    run(args.days, args.products)
@@ -0,0 +1,128 @@
+"""
+Benchmark offline da extração: produtos processados por segundo em cada parser de
+card das lojas e em cada extrator de `scraper_utils`.
+
+Usa as páginas gravadas em data/snapshots (python src/extraction/replay.py record)
+quando existem; sem elas, usa uma amostra sintética de cards.
+
+    python perf/bench_extraction.py [--products 20000] [--dir data/snapshots]
+"""
+import argparse
+import itertools
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.config import SNAPSHOT_DIR
+from src.extraction import scraper_utils
+from src.extraction.jobs import EXTRACTION_JOBS
+from src.extraction.title_parser import TitleParser
+from src.extraction.http_extract import parse_cards_html
+from src.extraction.store_specs import card_to_record
+from src.extraction.replay import load_snapshot_index, replay_scrapers
+
+SAMPLE_CPU_TITLES = [
+    "Processador AMD Ryzen 7 5700X3D, 3.0GHz (4.1GHz Max Turbo), Cache 100MB, AM4, Sem Vídeo - 100-100001503WOF",
+    "Processador Intel Core i5-12400F, 2.5GHz (4.4GHz Turbo), 6-Cores 12-Threads, LGA 1700, Sem Vídeo",
+    "Processador AMD Ryzen 5 7600, 3.8GHz (5.1GHz Max Turbo), Cache 38MB, 6 Núcleos, AM5, Com Vídeo",
+    "Processador Intel Core Ultra 7 265K, 3.9GHz (5.5GHz Turbo), 20-Cores, LGA1851, Com Vídeo",
+    "Processador Intel Core i9 14900K, 24-Cores, 32-Threads, 3.2GHz (6.0GHz Turbo), LGA 1700",
+    "Processador AMD Ryzen 9 9950X3D, 4.3GHz (5.7GHz Max Turbo), Cache 144MB, AM5",
+]
+SAMPLE_GPU_TITLES = [
+    "Placa de Vídeo Gigabyte GeForce RTX 4060 Ti Gaming OC, 8GB, GDDR6, DLSS, Ray Tracing",
+    "Placa de Vídeo PowerColor Radeon RX 7800 XT Hellhound, 16GB GDDR6, 256-bit",
+    "Placa de Video Asus Dual GeForce RTX 5070 OC Edition, 12GB GDDR7, DLSS 4",
+    "Placa de Vídeo Sapphire Pulse AMD Radeon RX 9070 XT, 16GB, GDDR6, FSR 4",
+    "Placa de Vídeo Intel Arc B580 Limited Edition, 12GB GDDR6, XeSS",
+    "Placa de Vídeo MSI GeForce RTX 3060 Ventus 2X OC, LHR, 12GB GDDR6, 192-bit",
+]
+SAMPLE_PRICES = ["R$ 1.234,56", "R$ 899,90", "R$ 4.599,99"]
+SAMPLE_INSTALLMENTS = ["10x de R$ 145,24", "12x de R$ 88,20", None]
+
+
+def synthetic_cards(store: str, product_type: str) -> list[dict]:
+    titles = SAMPLE_CPU_TITLES if product_type == "CPU" else SAMPLE_GPU_TITLES
+    cards = []
+    for title, price, installment in itertools.product(titles, SAMPLE_PRICES, SAMPLE_INSTALLMENTS):
+        card = {"title": title, "price": price, "link": "/produto/123/exemplo"}
+        if store == "Terabyte":
+            card["installment_spans"] = installment.replace(" de ", " ").split(" ", 1) if installment else []
+        else:
+            card["installment_text"] = installment
+        cards.append(card)
+    return cards
+
+
+def load_cards(snapshot_dir: str) -> dict:
+    """{(loja, tipo): cards} a partir das páginas gravadas ou da amostra sintética."""
+    try:
+        index = load_snapshot_index(snapshot_dir)
+    except FileNotFoundError:
+        index = {}
+
+    cards = {}
+    for _, store, product_type, url in EXTRACTION_JOBS:
+        files = [relative for page_url, relative in index.items() if page_url.split("?")[0] == url]
+        store_cards = []
+        for relative in files:
+            with open(os.path.join(snapshot_dir, relative), encoding="utf-8") as f:
+                store_cards.extend(parse_cards_html(f.read(), store))
+        cards[(store, product_type)] = store_cards or synthetic_cards(store, product_type)
+    return cards, bool(index)
+
+
+def rate(func, items: list, n: int) -> float:
+    """Itens processados por segundo ao aplicar `func` em `n` itens (repetindo a amostra)."""
+    sample = list(itertools.islice(itertools.cycle(items), n))
+    started = time.perf_counter()
+    for item in sample:
+        func(item)
+    return n / (time.perf_counter() - started)
+
+
+def run(n: int, snapshot_dir: str):
+    cards, recorded = load_cards(snapshot_dir)
+    print(f"Fonte dos cards: {'páginas gravadas em ' + snapshot_dir if recorded else 'amostra sintética'}")
+    print(f"Produtos por medição: {n}\n")
+
+    print("Parsers de card (card -> registro):")
+    for (store, product_type), store_cards in cards.items():
+        per_second = rate(lambda card: card_to_record(store, card, product_type), store_cards, n)
+        print(f"  {store:<9} {product_type}  {per_second:>12,.0f} produtos/s")
+
+    titles = [card["title"] or "" for store_cards in cards.values() for card in store_cards]
+    cpu_titles = [card["title"] or "" for (_, t), c in cards.items() if t == "CPU" for card in c]
+    gpu_titles = [card["title"] or "" for (_, t), c in cards.items() if t == "GPU" for card in c]
+
+    print("\nExtratores de scraper_utils:")
+    extractors = [
+        ("extract_brand", scraper_utils.extract_brand, titles),
+        ("extract_cpu_socket", scraper_utils.extract_cpu_socket, cpu_titles),
+        ("extract_cpu_model_and_variant", lambda t: scraper_utils.extract_cpu_model_and_variant(t, scraper_utils.extract_brand(t)), cpu_titles),
+        ("extract_gpu_model_and_variant", lambda t: scraper_utils.extract_gpu_model_and_variant(t, scraper_utils.extract_brand(t)), gpu_titles),
+        ("extract_gpu_manufacturer", scraper_utils.extract_gpu_manufacturer, gpu_titles),
+        ("extract_gpu_memory", scraper_utils.extract_gpu_memory, gpu_titles),
+        ("parse_installment_text", scraper_utils.parse_installment_text, SAMPLE_INSTALLMENTS),
+        ("TitleParser.parse (sem cache)", TitleParser(cache_size=0).parse, titles),
+        ("TitleParser.parse (com cache)", TitleParser().parse, titles),
+    ]
+    for name, func, items in extractors:
+        print(f"  {name:<31} {rate(func, items, n):>12,.0f} títulos/s")
+
+    if recorded:
+        print("\nReprodução completa dos scrapers (páginas gravadas):")
+        started = time.perf_counter()
+        results = replay_scrapers(snapshot_dir)
+        elapsed = time.perf_counter() - started
+        total = sum(len(items) for items in results.values())
+        print(f"  {total} produtos em {elapsed:.2f}s ({total / elapsed:,.0f} produtos/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+    run(args.products, args.dir)
@@ -0,0 +1,45 @@
+"""
+Mede o custo de encontrar o fabricante em um título conforme o dicionário cresce,
+comparando o ManufacturerMatcher com a varredura nome a nome (um `in` por fabricante).
+
+    python perf/bench_manufacturers.py [--titles 20000]
+"""
+import argparse
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.extraction.manufacturers import ManufacturerMatcher, GPU_MANUFACTURERS
+
+# Pior caso para os dois métodos: nenhum fabricante conhecido no título
+TITLE = "Placa de Vídeo NVIDIA GeForce RTX 4060 Ti Gaming OC, 8GB, GDDR6, DLSS, Ray Tracing"
+
+
+def per_title_us(func, n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        func(TITLE)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def run(n: int):
+    print(f"{'fabricantes':>11}  {'matcher':>10}  {'varredura':>10}")
+    for extra in (0, 100, 1000, 5000):
+        manufacturers = dict(GPU_MANUFACTURERS)
+        manufacturers.update({f"FABRICANTE{i:05d}": [] for i in range(extra)})
+        matcher = ManufacturerMatcher(manufacturers)
+        names = list(matcher.aliases)
+
+        def scan(title: str):
+            title_upper = title.upper()
+            return next((name for name in names if name in title_upper), None)
+
+        print(f"{len(names):>11}  {per_title_us(matcher.find, n):>8.2f}us  {per_title_us(scan, n):>8.2f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.titles)
@@ -0,0 +1,87 @@
+"""
+Normalização de preços e parcelas: `clean_price` linha a linha + os parsers de parcelas de
+`scraper_utils` contra as funções vetorizadas de src/transform/price_columns.py, com uma
+checagem de que os resultados são idênticos.
+
+    python perf/bench_prices.py [--rows 100000] [--distinct 5000 100000]
+"""
+import argparse
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.extraction.scraper_utils import parse_installment_text
+from src.transform.transform import clean_price
+from src.transform.price_columns import parse_price, parse_installments
+import pandas as pd
+import numpy as np
+
+# Casos sem preço/parcelamento encontrados nas lojas, misturados aos preços gerados
+MISSING_PRICES = ["N/A", None, "Indisponível"]
+MISSING_INSTALLMENTS = ["N/A", None, "à vista"]
+
+
+def brl(value: float) -> str:
+    return "R$ " + f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def sample(rows: int, distinct: int) -> pd.DataFrame:
+    """`rows` produtos com `distinct` preços diferentes (um ano de coletas repete muito os preços)."""
+    rng = np.random.default_rng(42)
+    catalog = rng.integers(20_00, 20_000_00, size=distinct) / 100
+    picks = catalog[rng.integers(0, distinct, size=rows)]
+    parcels = rng.choice([6, 10, 12], size=rows)
+    cash, installments = [], []
+    for i, (price, n) in enumerate(zip(picks, parcels)):
+        if i % 10 == 9:
+            cash.append(MISSING_PRICES[i % 3])
+            installments.append(MISSING_INSTALLMENTS[i % 3])
+            continue
+        cash.append(brl(price) if i % 4 else "R$\xa0" + brl(price)[3:])
+        installments.append(f"{n}x de {brl(price / n)}")
+    return pd.DataFrame({"cash_price": cash, "installment_text": installments})
+
+
+def row_by_row(df: pd.DataFrame) -> tuple:
+    cash = df["cash_price"].apply(clean_price)
+    parcels = [parse_installment_text(text if isinstance(text, str) else None) for text in df["installment_text"]]
+    installments = pd.Series([p["installments"] for p in parcels], dtype="float64").astype("Int64")
+    installment_price = pd.Series([p["installment_price"] for p in parcels], dtype="float64")
+    return cash, installments, installment_price
+
+
+def vectorized(df: pd.DataFrame) -> tuple:
+    cash = parse_price(df["cash_price"])
+    empty = pd.Series(np.nan, index=df.index)
+    installments, installment_price = parse_installments(df["installment_text"], empty)
+    return cash, installments, installment_price
+
+
+def timed(func, df: pd.DataFrame, repeat: int = 3) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(rows: int, distinct: list):
+    for n in distinct:
+        df = sample(rows, n)
+        slow, expected = timed(row_by_row, df)
+        fast, result = timed(vectorized, df)
+        for name, a, b in zip(("cash_price", "installments", "installment_price"), expected, result):
+            # Falha se qualquer valor diferir do caminho linha a linha
+            pd.testing.assert_series_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_names=False)
+        print(f"{rows} linhas, {n} preços distintos: linha a linha {slow * 1000:.1f} ms, "
+              f"vetorizado {fast * 1000:.1f} ms ({slow / fast:.1f}x), resultados idênticos")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, nargs="+", default=[5_000, 100_000])
+    args = parser.parse_args()
+    run(args.rows, args.distinct)
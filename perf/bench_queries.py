@@ -0,0 +1,79 @@
+"""
+Latência das consultas do dashboard (LATEST_QUERY e HISTORY_QUERY em src/load/load.py)
+conforme o histórico cresce: a tabela é gravada como o pipeline antigo a criava (to_sql,
+sem chave nem índices), medida, migrada por ensure_schema (src/load/db_schema.py: chave
+substituta, tipos e índices) e medida de novo. Com os índices, as duas consultas devem
+levar praticamente o mesmo tempo com 30 ou 365 dias de coletas.
+
+    python perf/bench_queries.py [--url sqlite:///data/bench_queries.db] [--days 30 90 365] [--products 1000]
+
+Sem --url, usa o banco do .env (DATABASE_URL). A tabela bench_queries é apagada no fim.
+"""
+import argparse
+import statistics
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from perf.bench_schema import synthetic_history
+from src.load import load
+from src.load.db_engine import get_engine
+from src.load.db_schema import ensure_schema, forget_schema
+from src.transform.schema import apply_schema, to_storage
+from sqlalchemy import text
+import pandas as pd
+
+TABLE = "bench_queries"
+
+
+def median_ms(engine, query, params=None, repeat: int = 7) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with engine.connect() as connection:
+            pd.read_sql_query(text(query), connection, params=params)
+        times.append(time.perf_counter() - started)
+    return 1000 * statistics.median(times)
+
+
+def measure(engine, product_key: str) -> tuple:
+    latest = load.LATEST_QUERY.format(table=TABLE)
+    history = load.HISTORY_QUERY.format(table=TABLE)
+    return median_ms(engine, latest), median_ms(engine, history, {"product_key": product_key})
+
+
+def run(days: list, products: int):
+    engine = get_engine(load.DATABASE_URL)
+    print(f"{'dias':>5} {'linhas':>10}  {'mais recente (ms)':>21}  {'histórico (ms)':>21}  migração")
+    for n in days:
+        history = to_storage(apply_schema(synthetic_history(n, products)))
+        # Uma chave por produto: o histórico sintético tem só 6 modelos, cada um em 1/6 das linhas
+        history["product_key"] = "produto " + history["link"].str.rsplit("/", n=1).str[-1]
+        product_key = history["product_key"].iloc[0]
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        try:
+            history.to_sql(TABLE, engine, index=False, chunksize=10_000)
+            latest_before, history_before = measure(engine, product_key)
+            started = time.perf_counter()
+            ensure_schema(engine, TABLE)
+            migration = time.perf_counter() - started
+            latest_after, history_after = measure(engine, product_key)
+            print(f"{n:>5} {len(history):>10,}  {latest_before:>8.1f} -> {latest_after:>8.1f}  "
+                  f"{history_before:>8.1f} -> {history_after:>8.1f}  {migration:.1f} s")
+        finally:
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+            forget_schema(engine, TABLE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL do banco (padrão: DATABASE_URL do .env)")
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90, 365])
+    parser.add_argument("--products", type=int, default=1000)
+    args = parser.parse_args()
+    if args.url:
+        load.DATABASE_URL = args.url
+    run(args.days, args.products)
@@ -0,0 +1,83 @@
+"""
+Memória de um histórico de vários dias de preços processados, como o dashboard carrega do
+banco: colunas de texto/object (o formato antigo) contra PROCESSED_SCHEMA
+(src/transform/schema.py: categorias, float32, Int16 e data).
+
+    python perf/bench_schema.py [--days 365] [--products 3000]
+"""
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.transform.schema import apply_schema, to_storage
+import pandas as pd
+import numpy as np
+
+STORES = ["Kabum", "Pichau", "Terabyte"]
+CPU_MODELS = [("AMD", "AM4", "RYZEN 5", "5600"), ("AMD", "AM5", "RYZEN 7", "7800X3D"), ("AMD", "AM5", "RYZEN 9", "9950X"),
+              ("INTEL", "LGA 1700", "I5", "12400F"), ("INTEL", "LGA 1700", "I7", "14700K"), ("INTEL", "LGA1851", "ULTRA 7", "265K")]
+
+
+def synthetic_history(days: int, products: int, seed: int = 42) -> pd.DataFrame:
+    """
+    `days` coletas diárias de `products` CPUs, com as colunas e os tipos que vêm do banco
+    (textos, float64, Int64 e a data como texto).
+    """
+    rng = np.random.default_rng(seed)
+    model = rng.integers(0, len(CPU_MODELS), size=products)
+    store = rng.integers(0, len(STORES), size=products)
+    base_price = rng.integers(500_00, 6_000_00, size=products) / 100
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days).strftime("%Y-%m-%d")
+
+    day = np.repeat(np.arange(days), products)
+    item = np.tile(np.arange(products), days)
+    # Preços variam alguns por cento de um dia para o outro
+    cash = np.round(base_price[item] * (1 + rng.normal(0, 0.03, size=len(item))), 2)
+    brand, socket, variant, base_model = (np.array([m[i] for m in CPU_MODELS], dtype=object) for i in range(4))
+    return pd.DataFrame({
+        "brand": brand[model[item]],
+        "socket": socket[model[item]],
+        "base_model": base_model[model[item]],
+        "variant": variant[model[item]],
+        "cash_price": cash,
+        "installments": pd.array(np.where(item % 5 == 0, 12, 10), dtype="Int64"),
+        "installment_price": np.round(cash / 10 * 1.05, 2),
+        "full_title": [f"Processador {variant[model[i]]} {base_model[model[i]]} ({i})" for i in item],
+        "link": [f"https://loja.com.br/produto/{i}" for i in item],
+        "store": np.array(STORES, dtype=object)[store[item]],
+        "extraction_date": np.asarray(dates, dtype=object)[day],
+    }).astype({"brand": object, "socket": object, "base_model": object, "variant": object,
+               "full_title": object, "link": object, "store": object, "extraction_date": object})
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def run(days: int, products: int):
+    history = synthetic_history(days, products)
+    compact = apply_schema(history)
+    before, after = memory_mb(history), memory_mb(compact)
+    print(f"{len(history):,} linhas ({days} dias x {products} produtos)")
+    print(f"  object/texto:     {before:8.1f} MB")
+    print(f"  PROCESSED_SCHEMA: {after:8.1f} MB ({before / after:.1f}x menor)")
+
+    by_column = pd.DataFrame({
+        "antes_MB": history.memory_usage(deep=True, index=False) / 2**20,
+        "depois_MB": compact.memory_usage(deep=True, index=False) / 2**20,
+    }).round(1)
+    print(by_column.to_string())
+
+    # Ida e volta sem perder centavos: o que seria gravado no banco é igual ao original
+    stored = to_storage(compact)
+    assert np.array_equal(stored["cash_price"].to_numpy(), history["cash_price"].to_numpy())
+    print("  preços idênticos após float32 -> gravação (centavos preservados)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--products", type=int, default=3000)
+    args = parser.parse_args()
+    run(args.days, args.products)
@@ -0,0 +1,122 @@
+"""
+Pico de memória e tempo até a primeira linha gravada: pipeline em lote (scrape_store ->
+DataFrame -> transformação -> CSV) contra o streaming em micro-lotes (iter_job_batches e
+stream_in_background, ver src/extraction/stream.py). Os dois caminhos rodam sobre páginas
+de listagem gravadas (ReplayPool, src/extraction/replay.py) com checkpoint ligado, como no
+pipeline, em catálogos sintéticos da Kabum de tamanho crescente. Cada medição começa com o
+cache do TitleParser vazio; o pico inclui esse cache, limitado a TITLE_PARSER_CACHE_SIZE títulos.
+
+    python perf/bench_stream.py [--sizes 5000 20000 80000] [--page-size 100] [--batch 500]
+"""
+import argparse
+import tempfile
+import tracemalloc
+import shutil
+import json
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.extraction.checkpoint import CheckpointJournal
+from src.extraction.engine import scrape_store
+from src.extraction.pacing import pacing_disabled
+from src.extraction.replay import INDEX_FILE, ReplayPool, snapshot_path
+from src.extraction.store_specs import STORE_SPECS, page_url
+from src.extraction.stream import iter_job_batches, stream_in_background
+from src.extraction.title_parser import default_title_parser
+from src.load.load import save_to_csv, append_to_csv
+from src.transform.transform import transform_raw_data
+import pandas as pd
+
+STORE, PRODUCT_TYPE = "Kabum", "CPU"
+JOB = (f"{STORE.lower()}_{PRODUCT_TYPE.lower()}", STORE, PRODUCT_TYPE, STORE_SPECS[STORE]["urls"][PRODUCT_TYPE])
+TITLES = [
+    "Processador AMD Ryzen 7 5700X3D, 3.0GHz (4.1GHz Max Turbo), Cache 100MB, AM4, Sem Vídeo",
+    "Processador Intel Core i5-12400F, 2.5GHz (4.4GHz Turbo), 6-Cores 12-Threads, LGA 1700, Sem Vídeo",
+    "Processador AMD Ryzen 5 7600, 3.8GHz (5.1GHz Max Turbo), Cache 38MB, 6 Núcleos, AM5, Com Vídeo",
+    "Processador Intel Core Ultra 7 265K, 3.9GHz (5.5GHz Turbo), 20-Cores, LGA1851, Com Vídeo",
+]
+
+
+def card_html(i: int) -> str:
+    return (f'<a class="productLink" href="produto/{i}"><span class="nameCard">{TITLES[i % len(TITLES)]} #{i}</span>'
+            f'<span class="priceCard">R$ {1000 + i % 900},90</span>'
+            f'<div class="priceTextCard"><b>10x de R$ {100 + i % 90},00</b></div></a>')
+
+
+def write_catalog(directory: str, n: int, page_size: int):
+    """Grava `n` produtos em páginas de `page_size` cards, com o índice url -> arquivo do ReplayPool."""
+    pages = -(-n // page_size)
+    pagination = STORE_SPECS[STORE]["pagination"]["param"]
+    index = {}
+    for page_number in range(1, pages + 1):
+        cards = "".join(card_html(i) for i in range((page_number - 1) * page_size, min(page_number * page_size, n)))
+        html = f'<html><body>{cards}<a href="?{pagination}={pages}">{pages}</a></body></html>'
+        relative = snapshot_path(STORE, PRODUCT_TYPE, page_number)
+        os.makedirs(os.path.dirname(os.path.join(directory, relative)), exist_ok=True)
+        with open(os.path.join(directory, relative), "w", encoding="utf-8") as f:
+            f.write(html)
+        index[page_url(STORE, JOB[3], page_number)] = relative
+    with open(os.path.join(directory, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+def run_batch(snapshots: str, batch: int, work: str):
+    checkpoint = CheckpointJournal("bench", directory=os.path.join(work, "checkpoints"))
+    records = scrape_store(STORE, PRODUCT_TYPE, ReplayPool(snapshots), checkpoint)
+    save_to_csv(transform_raw_data(pd.DataFrame(records), PRODUCT_TYPE, verbose=False), os.path.join(work, "out.csv"))
+    return None
+
+
+def run_stream(snapshots: str, batch: int, work: str) -> float:
+    checkpoint = CheckpointJournal("bench", directory=os.path.join(work, "checkpoints"))
+    first_row = None
+    started = time.perf_counter()
+    batches = stream_in_background(lambda: iter_job_batches([JOB], http_first=False, checkpoint=checkpoint,
+                                                            batch_size=batch, pool=ReplayPool(snapshots)))
+    for i, (_, records) in enumerate(batches):
+        append_to_csv(transform_raw_data(pd.DataFrame(records), PRODUCT_TYPE, verbose=False),
+                      os.path.join(work, "out.csv"), header=i == 0)
+        if first_row is None:
+            first_row = time.perf_counter() - started
+    return first_row
+
+
+def measure(func, snapshots: str, batch: int) -> tuple:
+    work = tempfile.mkdtemp()
+    default_title_parser.clear()
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        first_row = func(snapshots, batch, work)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rows = sum(1 for _ in open(os.path.join(work, "out.csv"), encoding="utf-8")) - 1
+    finally:
+        shutil.rmtree(work)
+    return peak / 2**20, elapsed, first_row if first_row is not None else elapsed, rows
+
+
+def run(sizes: list, page_size: int, batch: int):
+    print(f"{'produtos':>9}  {'modo':>9}  {'pico MiB':>9}  {'total s':>8}  {'1a linha s':>10}  {'linhas':>7}")
+    for n in sizes:
+        snapshots = tempfile.mkdtemp()
+        try:
+            write_catalog(snapshots, n, page_size)
+            with pacing_disabled():
+                for name, func in (("lote", run_batch), ("streaming", run_stream)):
+                    peak, elapsed, first_row, rows = measure(func, snapshots, batch)
+                    print(f"{n:>9}  {name:>9}  {peak:>9.1f}  {elapsed:>8.2f}  {first_row:>10.3f}  {rows:>7}")
+        finally:
+            shutil.rmtree(snapshots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 80000])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+    run(args.sizes, args.page_size, args.batch)
@@ -0,0 +1,84 @@
+"""
+Transformação das seis lojas/categorias: `transform_raw_data` chamado uma vez por DataFrame
+(como o pipeline fazia) contra `transform_all`, que concatena tudo e normaliza em uma única
+passada, com uma checagem de que cada loja/categoria sai idêntica.
+
+    python perf/bench_transform.py [--rows 50 500 5000]
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.extraction.jobs import EXTRACTION_JOBS
+from src.transform.transform import transform_raw_data, transform_all, split_by_job
+import pandas as pd
+import numpy as np
+
+GOLDEN_TITLES = os.path.join(os.path.dirname(__file__), "golden_titles.json")
+
+
+def sample(rows: int) -> dict:
+    """`rows` registros brutos por loja/categoria, com títulos reais e alguns itens sem preço."""
+    titles = [case["title"] for case in json.load(open(GOLDEN_TITLES, encoding="utf-8"))]
+    by_type = {
+        "CPU": [t for t in titles if t.lower().startswith("processador")],
+        "GPU": [t for t in titles if not t.lower().startswith("processador")],
+    }
+    rng = np.random.default_rng(42)
+    frames = {}
+    for key, store, product_type, _ in EXTRACTION_JOBS:
+        prices = rng.integers(300_00, 15_000_00, size=rows) / 100
+        frames[key] = pd.DataFrame({
+            "full_title": rng.choice(by_type[product_type], size=rows),
+            "cash_price": [f"R$ {p:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".") if i % 10 else "N/A"
+                           for i, p in enumerate(prices)],
+            "installments": np.where(np.arange(rows) % 10, 10, None),
+            "installment_price": np.round(prices / 10, 2),
+            "link": [f"https://{store.lower()}.com.br/produto/{i}" for i in range(rows)],
+            "store": store,
+            "product_type": product_type,
+        })
+    return frames
+
+
+def per_frame(frames: dict) -> dict:
+    return {key: transform_raw_data(df) for key, df in frames.items()}
+
+
+def unified(frames: dict) -> dict:
+    return {key: part for df in transform_all(frames).values() for key, part in split_by_job(df).items()}
+
+
+def timed(func, frames: dict, repeat: int = 5) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        # As mensagens de progresso das transformações não entram na medição
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            result = func(frames)
+            best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run(rows: list):
+    for n in rows:
+        frames = sample(n)
+        slow, expected = timed(per_frame, frames)
+        fast, result = timed(unified, frames)
+        for key, df in expected.items():
+            # Categorias do DataFrame unificado incluem as das outras lojas; os valores são os mesmos
+            pd.testing.assert_frame_equal(df, result[key], check_categorical=False)
+        print(f"{n} linhas x {len(frames)} lojas/categorias: seis chamadas {slow * 1000:.1f} ms, "
+              f"passada única {fast * 1000:.1f} ms ({slow / fast:.1f}x), resultados idênticos")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 500, 5000])
+    args = parser.parse_args()
+    run(args.rows)
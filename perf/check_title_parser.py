@@ -0,0 +1,116 @@
+"""
+Confere o TitleParser e as colunas derivadas da transformação (add_title_columns, que usa
+o parser) contra o corpus dourado (perf/golden_titles.json) e contra as funções extract_* de
+scraper_utils, e mede o ganho do cache em títulos repetidos.
+
+    python perf/check_title_parser.py [--repeat 200]
+
+Sai com código 1 se algum campo divergir.
+"""
+import argparse
+import json
+import time
+import sys
+import os
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.extraction import scraper_utils
+from src.extraction.title_parser import TitleParser
+from src.extraction.title_parser import default_title_parser
+from src.transform.title_columns import add_title_columns
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden_titles.json")
+
+
+def reference_fields(title: str) -> dict:
+    brand = scraper_utils.extract_brand(title)
+    cpu_base_model, cpu_variant = scraper_utils.extract_cpu_model_and_variant(title, brand)
+    gpu_base_model, gpu_custom_model = scraper_utils.extract_gpu_model_and_variant(title, brand)
+    return {
+        "brand": brand,
+        "socket": scraper_utils.extract_cpu_socket(title),
+        "cpu_base_model": cpu_base_model,
+        "cpu_variant": cpu_variant,
+        "gpu_base_model": gpu_base_model,
+        "gpu_custom_model": gpu_custom_model,
+        "manufacturer": scraper_utils.extract_gpu_manufacturer(title),
+        "vram_memory": scraper_utils.extract_gpu_memory(title),
+    }
+
+
+def check(corpus: list) -> int:
+    parser = TitleParser()
+    failures = 0
+    for entry in corpus:
+        title = entry["title"]
+        got = parser.parse(title)
+        for source, expected in (("golden", entry["expected"]), ("scraper_utils", reference_fields(title))):
+            if got != expected:
+                failures += 1
+                diff = {k: (got.get(k), v) for k, v in expected.items() if got.get(k) != v}
+                print(f"DIVERGÊNCIA ({source}) em {title!r}: {diff}")
+    return failures
+
+
+def check_vectorized(corpus: list) -> int:
+    """Mesma conferência para o DataFrame inteiro, nos dois tipos de produto."""
+    df = pd.DataFrame({"full_title": [entry["title"] for entry in corpus], "store": "Pichau"})
+    columns = {
+        "CPU": {"brand": "brand", "socket": "socket", "base_model": "cpu_base_model", "variant": "cpu_variant"},
+        "GPU": {"brand": "brand", "manufacturer": "manufacturer", "base_model": "gpu_base_model",
+                "custom_model": "gpu_custom_model", "vram_memory": "vram_memory"},
+    }
+    failures = 0
+    for product_type, mapping in columns.items():
+        parsed = add_title_columns(df, product_type)
+        for (_, row), entry in zip(parsed.iterrows(), corpus):
+            diff = {column: (row[column], entry["expected"][field])
+                    for column, field in mapping.items() if row[column] != entry["expected"][field]}
+            if diff:
+                failures += 1
+                print(f"DIVERGÊNCIA (add_title_columns {product_type}) em {entry['title']!r}: {diff}")
+    return failures
+
+
+def benchmark(titles: list, repeat: int):
+    workload = titles * repeat
+
+    started = time.perf_counter()
+    for title in workload:
+        reference_fields(title)
+    reference_elapsed = time.perf_counter() - started
+
+    timings = {}
+    for name, parser in (("TitleParser (sem cache)", TitleParser(cache_size=0)), ("TitleParser", TitleParser())):
+        started = time.perf_counter()
+        for title in workload:
+            parser.parse(title)
+        timings[name] = (time.perf_counter() - started, parser.stats())
+
+    # A transformação usa o parser compartilhado, começando com o cache vazio
+    default_title_parser.clear()
+    df = pd.DataFrame({"full_title": workload, "store": "Pichau"})
+    started = time.perf_counter()
+    for product_type in ("CPU", "GPU"):
+        add_title_columns(df, product_type)
+    timings["add_title_columns"] = ((time.perf_counter() - started) / 2, default_title_parser.stats())
+
+    print(f"\n{len(workload)} títulos ({len(titles)} distintos):")
+    print(f"  {'scraper_utils':<24} {len(workload) / reference_elapsed:>12,.0f} títulos/s")
+    for name, (elapsed, stats) in timings.items():
+        print(f"  {name:<24} {len(workload) / elapsed:>12,.0f} títulos/s "
+              f"({reference_elapsed / elapsed:.1f}x) cache={stats}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    failures = check(corpus) + check_vectorized(corpus)
+    print(f"{len(corpus)} títulos conferidos, {failures} divergências.")
+    benchmark([entry["title"] for entry in corpus], args.repeat)
+    sys.exit(1 if failures else 0)
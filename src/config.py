@@ -20,4 +20,96 @@ OUTPUT_PATHS_RAW = {
     'kabum_gpu_raw': os.path.join('data', 'raw', 'kabum', 'gpus', f'gpus_{today()}.csv'),
     'terabyte_cpu_raw': os.path.join('data', 'raw', 'terabyte', 'cpus', f'cpus_{today()}.csv'),
     'terabyte_gpu_raw': os.path.join('data', 'raw', 'terabyte', 'gpus', f'gpus_{today()}.csv'),
-}
\ No newline at end of file
+}
+
+# Navegador compartilhado entre os scrapers (ver src/extraction/browser_pool.py)
+BROWSER_HEADLESS = True  # set to False to see the browser
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/114.0.0.0 Safari/537.36"
+# Quantidade de páginas entregues por um contexto antes de ele ser descartado e recriado
+BROWSER_MAX_PAGES_PER_CONTEXT = 20
+
+# Modo de extração concorrente (ver src/extraction/async_engine.py)
+# Máximo de trabalhos (loja/categoria) simultâneos em cada loja; 1 mantém a mesma carga do modo sequencial
+ASYNC_DEFAULT_HOST_CONCURRENCY = 1
+ASYNC_HOST_CONCURRENCY = {
+    "www.pichau.com.br": 1,
+    "www.kabum.com.br": 1,
+    "www.terabyteshop.com.br": 1,
+}
+
+# Modo enxuto (ver src/extraction/lean_mode.py): bloqueia imagens, fontes, rastreadores e scripts de terceiros
+LEAN_MODE = False
+LEAN_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+LEAN_TRACKER_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net",
+    "facebook.net", "facebook.com", "connect.facebook.net", "hotjar.com", "clarity.ms",
+    "criteo.com", "criteo.net", "tiktok.com", "analytics.tiktok.com", "bat.bing.com",
+    "taboola.com", "outbrain.com", "nr-data.net", "rtbhouse.com", "pinterest.com", "smartsuppcdn.com",
+]
+# Domínios cujos scripts continuam liberados em cada loja (a listagem depende deles)
+LEAN_STORE_ALLOWLIST = {
+    "Kabum": ["kabum.com.br"],
+    "Pichau": ["pichau.com.br"],
+    "Terabyte": ["terabyteshop.com.br"],
+}
+# Tamanho médio estimado (bytes) de cada tipo de recurso bloqueado, usado no relatório de economia
+LEAN_ESTIMATED_BYTES = {"image": 40_000, "media": 400_000, "font": 50_000, "script": 60_000, "other": 10_000}
+
+# Espera por prontidão e ritmo adaptativo entre páginas (ver src/extraction/pacing.py)
+PACING_READY_TIMEOUT_MS = 15000   # tempo máximo esperando os cards aparecerem
+PACING_INITIAL_DELAY = 1.0        # segundos entre páginas no início (o mesmo intervalo fixo usado antes)
+PACING_MIN_DELAY = 0.25
+PACING_MAX_DELAY = 10.0
+PACING_FAST_RESPONSE = 2.0        # respostas abaixo disso (s) reduzem o intervalo
+PACING_SLOW_RESPONSE = 8.0        # respostas acima disso (s) ou erros aumentam o intervalo
+
+# Caminho rápido via HTTP, com o navegador como reserva (ver src/extraction/http_extract.py)
+HTTP_FAST_PATH = False
+HTTP_TIMEOUT = 30        # segundos
+HTTP_POOL_SIZE = 10      # conexões keep-alive mantidas por loja
+
+# Páginas de listagem gravadas para reprodução offline (ver src/extraction/replay.py)
+SNAPSHOT_DIR = os.path.join('data', 'snapshots')
+
+# Cache LRU do TitleParser (ver src/extraction/title_parser.py): títulos distintos mantidos em memória
+TITLE_PARSER_CACHE_SIZE = 20000
+
+# Diário de páginas extraídas para retomar execuções interrompidas (ver src/extraction/checkpoint.py)
+CHECKPOINT_DIR = os.path.join('data', 'checkpoints')
+# Novas tentativas de uma página que falhou; se ainda faltar alguma, o diário é mantido para a próxima execução
+PAGE_RETRIES = 2
+
+# Extração em processos separados (ver src/extraction/process_pool.py)
+# 0 desliga; None usa um processo por trabalho, limitado ao número de CPUs
+EXTRACTION_WORKERS = 0
+
+# Pipeline em streaming (ver src/extraction/stream.py): lotes de registros em trânsito entre extração e carga
+STREAM_QUEUE_SIZE = 8       # micro-lotes aguardando a transformação antes de a extração esperar
+STREAM_BATCH_SIZE = 500     # registros por micro-lote (páginas seguidas são agrupadas; as maiores, divididas)
+STREAM_DEDUP_PAGES = 5      # páginas recentes cujos links entram na deduplicação de cada trabalho
+
+# Métricas da extração por loja/categoria/página (ver src/extraction/metrics.py)
+METRICS_DIR = os.path.join('data', 'metrics')
+
+# Índice chave canônica -> benchmark usado pelo dashboard (ver src/transform/product_key.py)
+# Para cada categoria: CSV de benchmark e a coluna com o nome do modelo (a pontuação fica em "Pontuação")
+BENCHMARK_SOURCES = {
+    "CPU": (os.path.join('benchmarks', 'results', 'cpu', '2025_media_games.csv'), 'Processador'),
+    "GPU": (os.path.join('benchmarks', 'results', 'gpu', '2025_media_games.csv'), 'Placa de Vídeo'),
+}
+BENCHMARK_INDEX_PATH = os.path.join('data', 'benchmark_index.csv')
+
+# Backend das etapas colunares da transformação e do dashboard (ver src/transform/backend.py)
+# "pandas" ou "arrow" (pyarrow.compute, em várias threads); os resultados são idênticos
+DATAFRAME_BACKEND = "pandas"
+
+# Pool de conexões do engine compartilhado do banco (ver src/load/db_engine.py)
+DB_POOL_SIZE = 5            # conexões mantidas abertas
+DB_MAX_OVERFLOW = 5         # conexões extras em picos, fechadas ao serem devolvidas
+DB_POOL_TIMEOUT = 30        # segundos esperando uma conexão livre
+DB_POOL_PRE_PING = True     # testa a conexão antes de usar (descarta as derrubadas pelo servidor)
+DB_POOL_RECYCLE = 1800      # segundos até reabrir uma conexão (-1 nunca)
+DB_INSERT_BATCH_SIZE = 1000  # linhas por INSERT ... ON CONFLICT DO NOTHING (ver src/load/load.py)
+# "insert": INSERT ... ON CONFLICT em lotes (qualquer banco); "copy": COPY FROM STDIN para uma
+# tabela temporária e um único INSERT ... SELECT na tabela final (só PostgreSQL, bem mais rápido)
+DB_LOAD_METHOD = "insert"
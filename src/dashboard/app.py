@@ -2,7 +2,6 @@ import sys
 import streamlit as st
 import plotly.express as px
 import pandas as pd
-import re
 import os
 import locale
 
@@ -13,31 +12,14 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src.load.load import load_latest_data_from_database, load_product_history_from_database
+from src.transform.product_key import load_benchmark_index
+from src.transform.backend import join_on_key, cheapest_per_key
 
 try:
     locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
 except locale.Error:
     locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252') # Fallback para Windows
 
-def normalizar_nome_cpu(nome):
-    if not isinstance(nome, str): return ""
-    n = nome.lower()
-    n = re.sub(r'\b(amd|intel|core|ryzen|ultra)\b', '', n)
-    n = n.replace('-', ' ')
-
-    n = re.sub(r'(\d+k)f$', r'\1', n) # Trata o caso 'KF' -> 'K'
-    n = re.sub(r'(\d+)f$', r'\1', n)  # Trata o caso 'F' -> ''
-
-    n = re.sub(r'[^a-z0-9\s]', '', n)
-    return " ".join(sorted(n.split()))
-
-def normalizar_nome_gpu(nome):
-    if not isinstance(nome, str): return ""
-    n = nome.lower()
-    n = n.replace('-', ' ')
-    n = re.sub(r'[^a-z0-9\s]', '', n)
-    return " ".join(sorted(n.split()))
-
 def formatar_preco(preco):
     if pd.isna(preco): return "N/A"
     return locale.currency(preco, grouping=True)
@@ -48,13 +30,18 @@ def analyze_cost_benefit_ratio(df):
         df['cost_benefit_ratio_formatted'] = df['cost_benefit_ratio'].apply(formatar_preco)
     return df
 
+def carregar_benchmarks(product_type, nome_coluna_modelo):
+    # Índice chave canônica -> benchmark (ver src/transform/product_key.py); a chave dos produtos já vem do banco
+    indice = load_benchmark_index(product_type)
+    return indice.rename(columns={'model': nome_coluna_modelo, 'score': 'Pontuação'})
+
 @st.cache_data
 def carregar_e_processar_dados():
     try:
         df_db_cpu_full = load_latest_data_from_database("cpus")
         df_db_gpu_full = load_latest_data_from_database("gpus")
-        df_benchmarks_cpu = pd.read_csv('benchmarks/results/cpu/2025_media_games.csv')
-        df_benchmarks_gpu = pd.read_csv('benchmarks/results/gpu/2025_media_games.csv')
+        df_benchmarks_cpu = carregar_benchmarks("CPU", "Processador")
+        df_benchmarks_gpu = carregar_benchmarks("GPU", "Placa de Vídeo")
     except Exception as e:
         st.error(f"❌ Erro ao carregar os dados: {e}. Verifique a conexão com o banco e os arquivos de benchmark.")
         st.stop()
@@ -74,9 +61,9 @@ def carregar_e_processar_dados():
 
     # --- Processamento de CPU ---
     if not df_db_cpu.empty:
-        df_benchmarks_cpu['chave_normalizada'] = df_benchmarks_cpu['Processador'].apply(normalizar_nome_cpu)
-        df_db_cpu['chave_normalizada'] = (df_db_cpu['variant'] + ' ' + df_db_cpu['base_model']).apply(normalizar_nome_cpu)
-        df_cpu_all = pd.merge(df_db_cpu, df_benchmarks_cpu, on='chave_normalizada', how='inner')
+        # product_key é calculada na transformação e chega como categoria (ver src/transform/schema.py)
+        df_db_cpu['product_key'] = df_db_cpu['product_key'].astype(object)
+        df_cpu_all = join_on_key(df_db_cpu, df_benchmarks_cpu, 'product_key')
         if not df_cpu_all.empty:
             df_cpu_all = analyze_cost_benefit_ratio(df_cpu_all)
             df_cpu_all['cash_price_formatted'] = df_cpu_all['cash_price'].apply(formatar_preco)
@@ -85,9 +72,8 @@ def carregar_e_processar_dados():
 
     # --- Processamento de GPU ---
     if not df_db_gpu.empty:
-        df_benchmarks_gpu['chave_normalizada'] = df_benchmarks_gpu['Placa de Vídeo'].apply(normalizar_nome_gpu)
-        df_db_gpu['chave_normalizada'] = df_db_gpu['base_model'].apply(normalizar_nome_gpu)
-        df_gpu_all = pd.merge(df_db_gpu, df_benchmarks_gpu, on='chave_normalizada', how='inner')
+        df_db_gpu['product_key'] = df_db_gpu['product_key'].astype(object)
+        df_gpu_all = join_on_key(df_db_gpu, df_benchmarks_gpu, 'product_key')
         if not df_gpu_all.empty:
             df_gpu_all = analyze_cost_benefit_ratio(df_gpu_all)
             df_gpu_all['cash_price_formatted'] = df_gpu_all['cash_price'].apply(formatar_preco)
@@ -141,7 +127,7 @@ if not df_all.empty:
         (df_all['cash_price'] <= faixa_preco[1])
     ]
     if not df_filtrado_all.empty:
-        df_filtrado_cheapest = df_filtrado_all.loc[df_filtrado_all.groupby('chave_normalizada')['cash_price'].idxmin()]
+        df_filtrado_cheapest = cheapest_per_key(df_filtrado_all, 'product_key', 'cash_price')
     else:
         df_filtrado_cheapest = pd.DataFrame()
 else:
@@ -170,9 +156,9 @@ else:
     )
 
     if modelo_selecionado:
-        chave_selecionada = df_filtrado_cheapest[df_filtrado_cheapest[nome_coluna_modelo] == modelo_selecionado]['chave_normalizada'].iloc[0]
+        chave_selecionada = df_filtrado_cheapest[df_filtrado_cheapest[nome_coluna_modelo] == modelo_selecionado]['product_key'].iloc[0]
         # Usa o dataframe com TODAS as ofertas filtradas para mostrar as opções
-        opcoes_modelo = df_filtrado_all[df_filtrado_all['chave_normalizada'] == chave_selecionada].sort_values(by="cash_price")
+        opcoes_modelo = df_filtrado_all[df_filtrado_all['product_key'] == chave_selecionada].sort_values(by="cash_price")
         
         st.write(f"**Exibindo {len(opcoes_modelo)} ofertas encontradas para {modelo_selecionado}:**")
         st.dataframe(
@@ -185,7 +171,6 @@ else:
             hide_index=True, use_container_width=True
         )
 
-        base_model_selecionado = df_filtrado_cheapest[df_filtrado_cheapest[nome_coluna_modelo] == modelo_selecionado]['base_model'].iloc[0]
         st.subheader(f"📈 Histórico de Menores Preços para {modelo_selecionado}")
 
         #1: Selecionar o dataframe histórico correto (CPUs ou GPUs)
@@ -195,7 +180,7 @@ else:
         with st.spinner("Buscando histórico de preços..."):
             historico_do_modelo = load_product_history_from_database(
                 table_name=table_name,
-                base_model=base_model_selecionado
+                product_key=chave_selecionada
             )
         
         #3: Encontrar a oferta mais barata de cada dia de extração
@@ -0,0 +1,200 @@
+from playwright.async_api import async_playwright
+from urllib.parse import urlparse
+import asyncio
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import (
+    BROWSER_HEADLESS,
+    BROWSER_USER_AGENT,
+    ASYNC_DEFAULT_HOST_CONCURRENCY,
+    ASYNC_HOST_CONCURRENCY,
+    LEAN_MODE,
+    HTTP_FAST_PATH,
+    PAGE_RETRIES
+)
+from src.extraction.lean_mode import LeanStats, enable_lean_mode_async
+from src.extraction.pacing import wait_until_ready_async, rate_limiter_for
+from src.extraction.bulk_extract import extract_cards_async
+from src.extraction.checkpoint import CheckpointJournal
+from src.extraction.http_extract import http_scrape
+from src.extraction.metrics import METRICS, page_bytes_async
+from src.extraction.store_specs import STORE_SPECS, PAGE_COUNT_JS, page_url, last_page, pages_to_records
+from src.extraction.jobs import EXTRACTION_JOBS
+
+logger = get_logger()
+
+
+async def _load_page(context, store: str, product_type: str, page_number: int, url: str,
+                     lean_stats: LeanStats = None, count_pages: bool = False) -> tuple:
+    spec = STORE_SPECS[store]
+    page = await context.new_page()
+    if lean_stats is not None:
+        await enable_lean_mode_async(page, store, lean_stats)
+    try:
+        with METRICS.timer(store, product_type, page_number, "navigation_seconds"):
+            await page.goto(url, timeout=60000)
+            await wait_until_ready_async(page, spec["card"])
+        with METRICS.timer(store, product_type, page_number, "dom_extraction_seconds"):
+            cards = await extract_cards_async(page, store)
+        METRICS.add(store, product_type, page_number, products_found=len(cards),
+                    bytes_transferred=await page_bytes_async(page))
+        total_pages = await page.evaluate(PAGE_COUNT_JS, spec["pagination"]["param"]) if count_pages else None
+        return cards, total_pages
+    finally:
+        await page.close()
+
+
+async def _scrape_store(context, store: str, product_type: str, base_url: str, lean_stats: LeanStats = None,
+                        checkpoint: CheckpointJournal = None) -> list:
+    """Mesmo fluxo de engine.scrape_store: primeira página, total de páginas e o resto em lotes de abas."""
+    pagination = STORE_SPECS[store]["pagination"]
+    tabs = pagination["tabs"] if pagination else 1
+    rate_limiter = rate_limiter_for(urlparse(base_url).netloc)
+    cards_by_page = checkpoint.completed_pages(store, product_type) if checkpoint else {}
+    total_pages = checkpoint.total_pages(store, product_type) if checkpoint else None
+
+    if 1 not in cards_by_page:
+        for attempt in range(PAGE_RETRIES + 1):
+            logger.info(f"Fazendo scraping da página 1: {base_url}")
+            await rate_limiter.wait_async()
+            try:
+                with rate_limiter.track():
+                    first_cards, total_pages = await _load_page(context, store, product_type, 1, base_url, lean_stats,
+                                                                count_pages=pagination is not None)
+                break
+            except Exception as e:
+                logger.error(f"Erro ao acessar página 1 (tentativa {attempt + 1} de {PAGE_RETRIES + 1}): {e}")
+                if attempt == PAGE_RETRIES:
+                    if checkpoint:
+                        checkpoint.record_failure(store, product_type, 1)
+                    raise
+        if not first_cards:
+            logger.info(f"No {product_type} products found.")
+            return []
+        cards_by_page[1] = first_cards
+        if checkpoint:
+            checkpoint.record_page(store, product_type, 1, first_cards, total_pages=total_pages)
+    else:
+        logger.info(f"Retomando do checkpoint: {len(cards_by_page)} páginas já extraídas.")
+
+    async def fetch(page_number: int) -> bool:
+        url = page_url(store, base_url, page_number)
+        logger.info(f"Fazendo scraping da página {page_number}: {url}")
+        try:
+            cards_by_page[page_number], _ = await _load_page(context, store, product_type, page_number, url, lean_stats)
+        except Exception as e:
+            logger.error(f"Erro ao acessar página {page_number}: {e}")
+            return False
+        if checkpoint and cards_by_page[page_number]:
+            checkpoint.record_page(store, product_type, page_number, cards_by_page[page_number])
+        return True
+
+    # As páginas restantes são carregadas em lotes de `tabs` abas simultâneas; as que falharem
+    # são tentadas de novo e, se ainda faltarem, ficam registradas no checkpoint
+    remaining = [n for n in range(2, last_page(store, total_pages) + 1) if n not in cards_by_page]
+    for attempt in range(PAGE_RETRIES + 1):
+        if attempt:
+            logger.warning(f"Nova tentativa ({attempt} de {PAGE_RETRIES}) das páginas que falharam: {remaining}")
+        failed = []
+        for i in range(0, len(remaining), tabs):
+            page_numbers = remaining[i:i + tabs]
+            await rate_limiter.wait_async()
+            started = time.monotonic()
+            outcomes = await asyncio.gather(*(fetch(n) for n in page_numbers))
+            rate_limiter.record(time.monotonic() - started, ok=all(outcomes))
+            failed += [n for n, ok in zip(page_numbers, outcomes) if not ok]
+        remaining = failed
+        if not remaining:
+            break
+
+    if remaining:
+        logger.error(f"Páginas não extraídas da {store} ({product_type}) após {PAGE_RETRIES + 1} tentativas: {remaining}")
+        if checkpoint:
+            for page_number in remaining:
+                checkpoint.record_failure(store, product_type, page_number)
+
+    return pages_to_records(store, cards_by_page, product_type)
+
+
+async def _scrape_with_fallback(context, key: str, store: str, product_type: str, url: str,
+                                lean_stats: LeanStats = None, checkpoint: CheckpointJournal = None) -> list:
+    """
+    Mesmo fluxo de http_extract.scrape_with_fallback: o caminho HTTP (bloqueante) roda em uma
+    thread, sem travar os outros trabalhos, e o navegador só é usado se ele não trouxer dados.
+    """
+    started = time.perf_counter()
+    try:
+        items = await asyncio.to_thread(http_scrape, store, product_type, url)
+        path = "http"
+    except Exception as e:
+        logger.info(f"[{key}] Caminho HTTP indisponível ({e}). Usando o navegador.")
+        METRICS.discard(store, product_type)
+        items = await _scrape_store(context, store, product_type, url, lean_stats, checkpoint)
+        path = "browser"
+
+    latency = time.perf_counter() - started
+    METRICS.record_path(store, product_type, path, latency)
+    logger.info(f"[{key}] {len(items)} produtos via {path} em {latency:.2f}s")
+    return items
+
+
+async def _run_job(context, host_limits: dict, key: str, store: str, product_type: str, url: str,
+                   lean_stats: LeanStats = None, checkpoint: CheckpointJournal = None, http_first: bool = False) -> list:
+    host = urlparse(url).netloc
+    # O semáforo por loja limita quantos trabalhos (loja/categoria) acessam o mesmo site ao mesmo tempo
+    async with host_limits[host]:
+        logger.info(f"[async] Iniciando {key} ({url})")
+        try:
+            if http_first:
+                items = await _scrape_with_fallback(context, key, store, product_type, url, lean_stats, checkpoint)
+            else:
+                items = await _scrape_store(context, store, product_type, url, lean_stats, checkpoint)
+        except Exception as e:
+            logger.error(f"Erro no scraper da {store} para o item {product_type}: {e}")
+            items = []
+        logger.info(f"[async] {key} finalizado com {len(items)} produtos.")
+        return items
+
+
+async def scrape_all_async(jobs: list = EXTRACTION_JOBS, lean: bool = LEAN_MODE,
+                           checkpoint: CheckpointJournal = None, http_first: bool = HTTP_FAST_PATH) -> dict:
+    """Executa todos os trabalhos de extração ao mesmo tempo e devolve {chave: lista de produtos}."""
+    host_limits = {}
+    for _, _, _, url in jobs:
+        host = urlparse(url).netloc
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(ASYNC_HOST_CONCURRENCY.get(host, ASYNC_DEFAULT_HOST_CONCURRENCY))
+
+    lean_stats = LeanStats() if lean else None
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=BROWSER_HEADLESS)
+        context = await browser.new_context(user_agent=BROWSER_USER_AGENT)
+        try:
+            results = await asyncio.gather(*(
+                _run_job(context, host_limits, key, store, product_type, url, lean_stats, checkpoint, http_first)
+                for key, store, product_type, url in jobs
+            ))
+        finally:
+            await context.close()
+            await browser.close()
+
+    if lean_stats is not None:
+        lean_stats.log_summary()
+
+    return {key: items for (key, _, _, _), items in zip(jobs, results)}
+
+
+def run_async_extraction(jobs: list = EXTRACTION_JOBS, lean: bool = LEAN_MODE,
+                         checkpoint: CheckpointJournal = None, http_first: bool = HTTP_FAST_PATH) -> dict:
+    return asyncio.run(scrape_all_async(jobs, lean, checkpoint, http_first))
+
+
+if __name__ == "__main__":
+    results = run_async_extraction()
+    for key, items in results.items():
+        print(f"{key}: {len(items)} produtos")
@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import BROWSER_HEADLESS, BROWSER_USER_AGENT, BROWSER_MAX_PAGES_PER_CONTEXT, LEAN_MODE
+from src.extraction.lean_mode import LeanStats, enable_lean_mode
+
+logger = get_logger()
+
+
+class BrowserPool:
+    """
+    Mantém um único Chromium aberto e entrega páginas isoladas em contextos
+    que são reciclados após `max_pages_per_context` páginas, limitando o uso de memória.
+    """
+
+    def __init__(self, headless: bool = BROWSER_HEADLESS, user_agent: str = BROWSER_USER_AGENT,
+                 max_pages_per_context: int = BROWSER_MAX_PAGES_PER_CONTEXT, lean: bool = LEAN_MODE):
+        self.headless = headless
+        self.lean = lean
+        self.lean_stats = LeanStats() if lean else None
+        self.user_agent = user_agent
+        self.max_pages_per_context = max_pages_per_context
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._context_pages = 0  # páginas já entregues pelo contexto atual
+        self._open_pages = 0     # páginas ainda abertas no contexto atual
+        self._retired = []       # contextos esgotados aguardando suas páginas fecharem
+        self.stats = {"contexts_created": 0, "contexts_recycled": 0, "pages_served": 0}
+
+    def start(self):
+        if self._browser is None:
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            logger.info("Navegador compartilhado iniciado.")
+        return self
+
+    def close(self):
+        for context, _ in self._retired:
+            self._safe_close(context)
+        self._retired = []
+        if self._context is not None:
+            self._safe_close(self._context)
+            self._context = None
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is None:
+            return
+        self._playwright.stop()
+        self._playwright = None
+        logger.info(f"Navegador compartilhado finalizado. Estatísticas: {self.stats}")
+        if self.lean_stats is not None:
+            self.lean_stats.log_summary()
+
+    def __enter__(self):
+        # O Chromium só é iniciado na primeira página pedida
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _new_context(self):
+        self._context = self._browser.new_context(user_agent=self.user_agent)
+        self._context_pages = 0
+        self._open_pages = 0
+        self.stats["contexts_created"] += 1
+
+    def _retire_context(self):
+        # O contexto só é fechado quando a última página emprestada dele for devolvida
+        if self._open_pages == 0:
+            self._safe_close(self._context)
+        else:
+            self._retired.append((self._context, self._open_pages))
+        self._context = None
+        self.stats["contexts_recycled"] += 1
+
+    def _release(self, context):
+        if context is self._context:
+            self._open_pages -= 1
+            return
+        for i, (retired, open_pages) in enumerate(self._retired):
+            if retired is context:
+                if open_pages <= 1:
+                    self._safe_close(retired)
+                    self._retired.pop(i)
+                else:
+                    self._retired[i] = (retired, open_pages - 1)
+                return
+
+    @staticmethod
+    def _safe_close(context):
+        try:
+            context.close()
+        except Exception as e:
+            logger.error(f"Erro ao fechar contexto do navegador: {e}")
+
+    @contextmanager
+    def page(self, store: str = None):
+        """
+        Empresta uma página nova; ela é fechada ao sair do bloco `with`.
+        No modo enxuto, `store` escolhe a lista de domínios liberados daquela loja.
+        """
+        self.start()
+        if self._context is None:
+            self._new_context()
+        elif self._context_pages >= self.max_pages_per_context:
+            self._retire_context()
+            self._new_context()
+
+        context = self._context
+        page = context.new_page()
+        self._context_pages += 1
+        self._open_pages += 1
+        self.stats["pages_served"] += 1
+        if self.lean:
+            enable_lean_mode(page, store, self.lean_stats)
+        try:
+            yield page
+        finally:
+            try:
+                page.close()
+            except Exception as e:
+                logger.error(f"Erro ao fechar página do navegador: {e}")
+            self._release(context)
+
+
+@contextmanager
+def borrow_pool(pool: BrowserPool = None):
+    """Usa o pool recebido ou, quando o scraper roda sozinho, abre um pool próprio."""
+    if pool is not None:
+        yield pool
+        return
+    with BrowserPool() as own_pool:
+        yield own_pool
@@ -0,0 +1,35 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+# Seletores de cada loja: "card" e "fields" de cada entrada (ver store_specs.py)
+from src.extraction.store_specs import STORE_SPECS
+
+# Lê todos os cards da página em uma única chamada ao navegador e devolve dicts simples
+BULK_EXTRACT_JS = """
+([cardSelector, fields]) => {
+    const read = (el, attr) => attr ? el.getAttribute(attr) : el.innerText.trim();
+    return Array.from(document.querySelectorAll(cardSelector)).map(card => {
+        const out = {};
+        for (const [name, [selector, attr, all]] of Object.entries(fields)) {
+            if (all) {
+                out[name] = Array.from(card.querySelectorAll(selector)).map(el => read(el, attr));
+                continue;
+            }
+            const el = selector ? card.querySelector(selector) : card;
+            out[name] = el ? read(el, attr) : null;
+        }
+        return out;
+    });
+}
+"""
+
+
+def extract_cards(page, store: str) -> list[dict]:
+    spec = STORE_SPECS[store]
+    return page.evaluate(BULK_EXTRACT_JS, [spec["card"], spec["fields"]])
+
+
+async def extract_cards_async(page, store: str) -> list[dict]:
+    spec = STORE_SPECS[store]
+    return await page.evaluate(BULK_EXTRACT_JS, [spec["card"], spec["fields"]])
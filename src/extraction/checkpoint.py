@@ -0,0 +1,134 @@
+import glob
+import json
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import CHECKPOINT_DIR, today
+
+logger = get_logger()
+
+
+class CheckpointJournal:
+    """
+    Diário das páginas de listagem já extraídas em uma execução. Cada página concluída
+    vira uma linha JSON (run id, loja, categoria, página e os cards lidos), gravada assim
+    que a página termina; uma página que falhou em todas as tentativas também vira uma linha
+    (marcada com "failed"). Ao rodar de novo com o mesmo run id, os scrapers pulam as
+    páginas que já estão no diário e só buscam as que faltam.
+    """
+
+    def __init__(self, run_id: str = None, directory: str = CHECKPOINT_DIR, shard: str = None):
+        self.run_id = run_id or today()
+        self.directory = directory
+        # Processos paralelos gravam cada um no seu arquivo (<run id>.<shard>.jsonl); a leitura junta todos
+        self.path = os.path.join(directory, f"{self.run_id}.{shard}.jsonl" if shard else f"{self.run_id}.jsonl")
+        # Só os números das páginas ficam em memória; os cards são relidos do arquivo ao retomar
+        self._pages = {}        # (loja, categoria) -> {páginas}
+        self._total_pages = {}  # (loja, categoria) -> total de páginas informado na página 1
+        self._load()
+
+    def _files(self) -> list[str]:
+        main = os.path.join(self.directory, f"{self.run_id}.jsonl")
+        shards = glob.glob(os.path.join(self.directory, f"{glob.escape(self.run_id)}.*.jsonl"))
+        return [path for path in [main, *sorted(shards)] if os.path.exists(path)]
+
+    def _entries(self):
+        """Linhas do diário, uma página por vez, em todos os arquivos da execução."""
+        for path in self._files():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Última linha incompleta de uma execução interrompida no meio da escrita
+                        continue
+
+    def _load(self):
+        for entry in self._entries():
+            if entry.get("failed"):
+                continue
+            key = (entry["store"], entry["product_type"])
+            self._pages.setdefault(key, set()).add(entry["page"])
+            if entry.get("total_pages") is not None:
+                self._total_pages[key] = entry["total_pages"]
+
+        pages = sum(len(p) for p in self._pages.values())
+        if pages:
+            logger.info(f"Checkpoint '{self.run_id}': {pages} páginas já extraídas serão reaproveitadas.")
+
+    def completed_page_numbers(self, store: str, product_type: str) -> set:
+        return set(self._pages.get((store, product_type), ()))
+
+    def iter_completed_pages(self, store: str, product_type: str):
+        """Gerador (página, cards) das páginas já extraídas, lidas do arquivo na ordem em que foram gravadas."""
+        yielded = set()
+        for entry in self._entries():
+            if entry.get("failed") or (entry["store"], entry["product_type"]) != (store, product_type):
+                continue
+            if entry["page"] not in yielded:
+                yielded.add(entry["page"])
+                yield entry["page"], entry["cards"]
+
+    def completed_pages(self, store: str, product_type: str) -> dict:
+        return dict(self.iter_completed_pages(store, product_type))
+
+    def total_pages(self, store: str, product_type: str) -> int:
+        return self._total_pages.get((store, product_type))
+
+    def _append(self, entry: dict):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_page(self, store: str, product_type: str, page: int, cards: list, total_pages: int = None):
+        self._append({
+            "run_id": self.run_id, "store": store, "product_type": product_type,
+            "page": page, "total_pages": total_pages, "cards": cards
+        })
+
+        key = (store, product_type)
+        self._pages.setdefault(key, set()).add(page)
+        if total_pages is not None:
+            self._total_pages[key] = total_pages
+
+    def record_failure(self, store: str, product_type: str, page: int):
+        """Registra uma página que não pôde ser extraída (ver missing_pages)."""
+        self._append({"run_id": self.run_id, "store": store, "product_type": product_type, "page": page, "failed": True})
+
+    def missing_pages(self) -> dict:
+        """
+        Páginas que falharam e ainda não foram extraídas, {(loja, categoria): [páginas]}.
+        Relê os arquivos, incluindo os gravados por outros processos (ver process_pool.py).
+        """
+        failed, done = {}, {}
+        for entry in self._entries():
+            key = (entry["store"], entry["product_type"])
+            (failed if entry.get("failed") else done).setdefault(key, set()).add(entry["page"])
+        missing = {key: sorted(pages - done.get(key, set())) for key, pages in failed.items()}
+        return {key: pages for key, pages in missing.items() if pages}
+
+    def clear_if_complete(self) -> dict:
+        """
+        Descarta o diário se nenhuma página ficou faltando; senão ele é mantido, e rodar de
+        novo com o mesmo run id busca só as páginas que faltam. Devolve as páginas faltantes.
+        """
+        missing = self.missing_pages()
+        if not missing:
+            self.clear()
+            return missing
+        pages = "; ".join(f"{store} {product_type}: {numbers}" for (store, product_type), numbers in missing.items())
+        logger.warning(f"Páginas não extraídas ({pages}). Checkpoint '{self.run_id}' mantido: rode de novo "
+                       f"com --run-id {self.run_id} para buscar só essas páginas.")
+        return missing
+
+    def clear(self):
+        """Descarta o diário (execução concluída ou recomeço do zero)."""
+        for path in self._files():
+            os.remove(path)
+        self._pages.clear()
+        self._total_pages.clear()
+
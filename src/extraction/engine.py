@@ -0,0 +1,171 @@
+from contextlib import ExitStack
+from urllib.parse import urlparse
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import PAGE_RETRIES
+from src.extraction.browser_pool import BrowserPool, borrow_pool
+from src.extraction.bulk_extract import extract_cards
+from src.extraction.checkpoint import CheckpointJournal
+from src.extraction.metrics import METRICS, page_bytes
+from src.extraction.pacing import wait_until_ready, rate_limiter_for
+from src.extraction.store_specs import STORE_SPECS, PAGE_COUNT_JS, page_url, last_page, pages_to_records
+
+logger = get_logger()
+
+
+def _fetch_batch(browser_pool: BrowserPool, store: str, product_type: str, base_url: str, page_numbers: list,
+                 rate_limiter) -> dict:
+    """Carrega um lote de páginas em abas diferentes ao mesmo tempo."""
+    card_selector = STORE_SPECS[store]["card"]
+    cards_by_page = {}
+    rate_limiter.wait()
+    started = time.monotonic()
+    with ExitStack() as stack:
+        pages = {n: stack.enter_context(browser_pool.page(store)) for n in page_numbers}
+
+        # Dispara todas as navegações antes de esperar por qualquer uma delas
+        for page_number, page in pages.items():
+            url = page_url(store, base_url, page_number)
+            logger.info(f"Fazendo scraping da página {page_number}: {url}")
+            try:
+                page.goto(url, timeout=60000, wait_until="commit")
+            except Exception as e:
+                logger.error(f"Erro ao acessar página {page_number}: {e}")
+                pages[page_number] = None
+
+        for page_number, page in pages.items():
+            if page is None:
+                continue
+            try:
+                wait_until_ready(page, card_selector)
+                # As navegações do lote correm juntas: a latência de cada página vai do início do lote até ela ficar pronta
+                METRICS.add(store, product_type, page_number, navigation_seconds=time.monotonic() - started)
+                with METRICS.timer(store, product_type, page_number, "dom_extraction_seconds"):
+                    cards_by_page[page_number] = extract_cards(page, store)
+                METRICS.add(store, product_type, page_number, products_found=len(cards_by_page[page_number]),
+                            bytes_transferred=page_bytes(page))
+                logger.info(f"Encontrados {len(cards_by_page[page_number])} produtos na página {page_number}")
+            except Exception as e:
+                logger.error(f"Erro ao acessar página {page_number}: {e}")
+
+    rate_limiter.record(time.monotonic() - started, ok=len(cards_by_page) == len(page_numbers))
+    return cards_by_page
+
+
+def _fetch_first_page(browser_pool: BrowserPool, store: str, product_type: str, base_url: str, rate_limiter) -> tuple:
+    """Carrega a página 1 e lê os cards e o total de páginas (None se a loja não for paginada)."""
+    spec = STORE_SPECS[store]
+    total_pages = None
+    logger.info(f"Fazendo scraping da página 1: {base_url}")
+    rate_limiter.wait()
+    with browser_pool.page(store) as page:
+        with rate_limiter.track(), METRICS.timer(store, product_type, 1, "navigation_seconds"):
+            page.goto(base_url, timeout=60000)
+            # Espera os cards aparecerem (ou a rede ficar ociosa) em vez de um tempo fixo
+            wait_until_ready(page, spec["card"])
+        # Uma única chamada ao navegador para todos os cards
+        with METRICS.timer(store, product_type, 1, "dom_extraction_seconds"):
+            cards = extract_cards(page, store)
+        METRICS.add(store, product_type, 1, products_found=len(cards), bytes_transferred=page_bytes(page))
+        if spec["pagination"]:
+            total_pages = page.evaluate(PAGE_COUNT_JS, spec["pagination"]["param"])
+    return cards, total_pages
+
+
+def iter_store_pages(store: str, product_type: str, pool: BrowserPool = None, checkpoint: CheckpointJournal = None,
+                     url: str = None, tabs: int = None):
+    """
+    Gerador com as páginas de uma loja/categoria descrita em STORE_SPECS, na forma
+    (número da página, cards), assim que cada uma é lida: primeiro as que já estão no
+    checkpoint, depois a página 1, o total de páginas (se a loja for paginada) e as
+    demais em lotes de abas simultâneas. Páginas que falharem são tentadas de novo
+    (PAGE_RETRIES vezes); as que ainda faltarem ficam registradas no checkpoint como falhas.
+    """
+    spec = STORE_SPECS[store]
+    product_type = product_type.upper()
+    base_url = url or spec["urls"][product_type]
+    pagination = spec["pagination"]
+    tabs = tabs or (pagination["tabs"] if pagination else 1)
+    rate_limiter = rate_limiter_for(urlparse(base_url).netloc)
+    # Só os números das páginas já entregues ficam em memória, não os cards: no streaming o
+    # consumo não cresce com o tamanho do catálogo
+    done_pages = checkpoint.completed_page_numbers(store, product_type) if checkpoint else set()
+    total_pages = checkpoint.total_pages(store, product_type) if checkpoint else None
+    first_page_products = None
+    if done_pages:
+        # Páginas já extraídas em uma execução anterior com o mesmo run id
+        logger.info(f"Retomando do checkpoint: {len(done_pages)} páginas já extraídas.")
+        for page_number, cards in checkpoint.iter_completed_pages(store, product_type):
+            if page_number == 1:
+                first_page_products = len(cards)
+            yield page_number, cards
+
+    with borrow_pool(pool) as browser_pool:
+        if 1 not in done_pages:
+            for attempt in range(PAGE_RETRIES + 1):
+                try:
+                    cards, total_pages = _fetch_first_page(browser_pool, store, product_type, base_url, rate_limiter)
+                    break
+                except Exception as e:
+                    logger.error(f"Erro ao acessar página 1 (tentativa {attempt + 1} de {PAGE_RETRIES + 1}): {e}")
+                    if attempt == PAGE_RETRIES:
+                        if checkpoint:
+                            checkpoint.record_failure(store, product_type, 1)
+                        raise
+
+            if not cards:
+                logger.info(f"No {product_type} products found.")
+                return
+            if checkpoint:
+                checkpoint.record_page(store, product_type, 1, cards, total_pages=total_pages)
+            done_pages.add(1)
+            first_page_products = len(cards)
+            yield 1, cards
+
+        final_page = last_page(store, total_pages)
+        if pagination:
+            logger.info(f"Encontrados {first_page_products} produtos na página 1. Total de {final_page} páginas, {tabs} abas em paralelo.")
+
+        remaining = [n for n in range(2, final_page + 1) if n not in done_pages]
+        for attempt in range(PAGE_RETRIES + 1):
+            if attempt:
+                logger.warning(f"Nova tentativa ({attempt} de {PAGE_RETRIES}) das páginas que falharam: {remaining}")
+            failed = []
+            for i in range(0, len(remaining), tabs):
+                page_numbers = remaining[i:i + tabs]
+                batch = _fetch_batch(browser_pool, store, product_type, base_url, page_numbers, rate_limiter)
+                failed += [n for n in page_numbers if n not in batch]
+                for page_number in sorted(batch):
+                    cards = batch[page_number]
+                    if checkpoint and cards:
+                        checkpoint.record_page(store, product_type, page_number, cards)
+                    done_pages.add(page_number)
+                    yield page_number, cards
+            remaining = failed
+            if not remaining:
+                break
+
+        if remaining:
+            logger.error(f"Páginas não extraídas da {store} ({product_type}) após {PAGE_RETRIES + 1} tentativas: {remaining}")
+            if checkpoint:
+                for page_number in remaining:
+                    checkpoint.record_failure(store, product_type, page_number)
+
+
+def scrape_store(store: str, product_type: str, pool: BrowserPool = None, checkpoint: CheckpointJournal = None,
+                 url: str = None, tabs: int = None) -> list[dict]:
+    """Extrai uma loja/categoria inteira (ver iter_store_pages) e devolve os registros brutos."""
+    product_type = product_type.upper()
+    try:
+        cards_by_page = dict(iter_store_pages(store, product_type, pool, checkpoint, url=url, tabs=tabs))
+        records = pages_to_records(store, cards_by_page, product_type)
+        logger.info(f"Scraping concluído. Total de {len(records)} {product_type} da {store} coletados de {len(cards_by_page)} páginas.")
+        return records
+
+    except Exception as e:
+        logger.error(f"Erro no scraper da {store} para o item {product_type}: {e}")
+        return []
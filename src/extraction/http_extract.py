@@ -0,0 +1,152 @@
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+import requests
+import time
+import re
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import BROWSER_USER_AGENT, HTTP_TIMEOUT, HTTP_POOL_SIZE, PAGE_RETRIES
+from src.extraction.metrics import METRICS
+from src.extraction.pacing import rate_limiter_for
+from src.extraction.store_specs import STORE_SPECS, page_url, last_page, pages_to_records
+
+logger = get_logger()
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+_session = None
+
+
+class FastPathMiss(Exception):
+    """A resposta HTTP não trouxe os cards esperados; é preciso usar o navegador."""
+
+
+def get_session() -> requests.Session:
+    """Sessão única com conexões keep-alive reaproveitadas entre as páginas e lojas."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        _session.headers.update({
+            "User-Agent": BROWSER_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "pt-BR,pt;q=0.9",
+        })
+    return _session
+
+
+def parse_cards_html(html: str, store: str) -> list[dict]:
+    """Mesmo resultado de `extract_cards`, mas lido do HTML renderizado no servidor."""
+    spec = STORE_SPECS[store]
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    def read(el, attr):
+        return el.get(attr) if attr else el.get_text().strip()
+
+    cards = []
+    for card in soup.select(spec["card"]):
+        out = {}
+        for name, (selector, attr, all_matches) in spec["fields"].items():
+            if all_matches:
+                out[name] = [read(el, attr) for el in card.select(selector)]
+                continue
+            el = card.select_one(selector) if selector else card
+            out[name] = read(el, attr) if el is not None else None
+        cards.append(out)
+    return cards
+
+
+def count_pages_html(html: str, param: str = "page_number") -> int:
+    numbers = [int(n) for n in re.findall(re.escape(param) + r"=(\d+)", html)]
+    return max(numbers) if numbers else 1
+
+
+def _fetch_html(url: str) -> str:
+    response = get_session().get(url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response.text
+
+
+def _fetch_page(store: str, product_type: str, page_number: int, url: str) -> tuple:
+    """Baixa e lê uma página de listagem, registrando as métricas dela. Devolve (html, cards)."""
+    with METRICS.timer(store, product_type, page_number, "navigation_seconds"):
+        html = _fetch_html(url)
+    with METRICS.timer(store, product_type, page_number, "dom_extraction_seconds"):
+        cards = parse_cards_html(html, store)
+    METRICS.add(store, product_type, page_number, products_found=len(cards), bytes_transferred=len(html.encode("utf-8")))
+    return html, cards
+
+
+def iter_http_pages(store: str, product_type: str, url: str):
+    """
+    Gerador com as páginas de uma loja/categoria extraídas sem navegador, na forma (número
+    da página, cards), assim que cada uma é lida. Lança FastPathMiss se o HTML não tiver os
+    cards ou se alguma página continuar falhando depois de PAGE_RETRIES novas tentativas.
+    """
+    html, cards = _fetch_page(store, product_type, 1, url)
+    if not cards:
+        raise FastPathMiss(f"nenhum card '{STORE_SPECS[store]['card']}' no HTML")
+
+    pagination = STORE_SPECS[store]["pagination"]
+    total_pages = count_pages_html(html, pagination["param"]) if pagination else None
+    del html
+    yield 1, cards
+
+    rate_limiter = rate_limiter_for(urlparse(url).netloc)
+    remaining = list(range(2, last_page(store, total_pages) + 1))
+    for attempt in range(PAGE_RETRIES + 1):
+        failed = []
+        for page_number in remaining:
+            rate_limiter.wait()
+            try:
+                with rate_limiter.track():
+                    _, cards = _fetch_page(store, product_type, page_number, page_url(store, url, page_number))
+            except Exception as e:
+                logger.error(f"Erro ao acessar página {page_number}: {e}")
+                failed.append(page_number)
+                continue
+            yield page_number, cards
+        remaining = failed
+        if not remaining:
+            break
+    if remaining:
+        # Sem essas páginas a listagem ficaria incompleta: o navegador (com checkpoint) assume
+        raise FastPathMiss(f"páginas {remaining} falharam após {PAGE_RETRIES + 1} tentativas")
+
+
+def http_scrape(store: str, product_type: str, url: str) -> list[dict]:
+    """Extrai uma loja/categoria inteira sem navegador (ver iter_http_pages) e devolve os registros brutos."""
+    return pages_to_records(store, dict(iter_http_pages(store, product_type, url)), product_type)
+
+
+def scrape_with_fallback(key: str, store: str, product_type: str, url: str, browser_scraper) -> list[dict]:
+    """
+    Tenta o caminho HTTP e, se ele não trouxer dados, chama `browser_scraper()` (Playwright).
+    O caminho usado e a latência (incluindo a tentativa HTTP) ficam em METRICS.
+    """
+    started = time.perf_counter()
+    try:
+        items = http_scrape(store, product_type, url)
+        path = "http"
+    except Exception as e:
+        logger.info(f"[{key}] Caminho HTTP indisponível ({e}). Usando o navegador.")
+        # As páginas já lidas pela tentativa HTTP (ex: a primeira) não se somam às do navegador
+        METRICS.discard(store, product_type)
+        items = browser_scraper()
+        path = "browser"
+
+    latency = time.perf_counter() - started
+    # Caminho e latência também vão para as métricas exportadas (Prometheus e JSON)
+    METRICS.record_path(store, product_type, path, latency)
+    logger.info(f"[{key}] {len(items)} produtos via {path} em {latency:.2f}s")
+    return items
@@ -0,0 +1,12 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.extraction.store_specs import STORE_SPECS
+
+# Os trabalhos de extração do pipeline, um por loja/tipo em STORE_SPECS: (chave, loja, tipo, url)
+EXTRACTION_JOBS = [
+    (f"{store.lower()}_{product_type.lower()}", store, product_type, url)
+    for store, spec in STORE_SPECS.items()
+    for product_type, url in spec["urls"].items()
+]
@@ -0,0 +1,106 @@
+from urllib.parse import urlparse
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import (
+    LEAN_BLOCKED_RESOURCE_TYPES,
+    LEAN_TRACKER_DOMAINS,
+    LEAN_STORE_ALLOWLIST,
+    LEAN_ESTIMATED_BYTES
+)
+
+logger = get_logger()
+
+
+def _matches_domain(host: str, domains: list) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def should_block(url: str, resource_type: str, store: str = None) -> bool:
+    """Decide se uma requisição pode ser descartada sem afetar o texto da listagem."""
+    if resource_type in LEAN_BLOCKED_RESOURCE_TYPES:
+        return True
+
+    host = urlparse(url).hostname or ""
+    if _matches_domain(host, LEAN_TRACKER_DOMAINS):
+        return True
+
+    # Scripts de terceiros só passam se o domínio estiver na lista da loja
+    allowlist = LEAN_STORE_ALLOWLIST.get(store)
+    if resource_type == "script" and allowlist is not None:
+        return not _matches_domain(host, allowlist)
+
+    return False
+
+
+class LeanStats:
+    """Contadores de requisições bloqueadas e estimativa de bytes economizados."""
+
+    def __init__(self):
+        self.allowed = 0
+        self.blocked = {}
+
+    def record(self, resource_type: str, blocked: bool):
+        if blocked:
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+        else:
+            self.allowed += 1
+
+    @property
+    def blocked_total(self) -> int:
+        return sum(self.blocked.values())
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        return sum(
+            count * LEAN_ESTIMATED_BYTES.get(resource_type, LEAN_ESTIMATED_BYTES["other"])
+            for resource_type, count in self.blocked.items()
+        )
+
+    def summary(self) -> dict:
+        return {
+            "allowed_requests": self.allowed,
+            "blocked_requests": self.blocked_total,
+            "blocked_by_type": dict(self.blocked),
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+        }
+
+    def log_summary(self):
+        logger.info(
+            f"Modo enxuto: {self.blocked_total} requisições bloqueadas, {self.allowed} liberadas, "
+            f"~{self.estimated_bytes_saved / 1024 / 1024:.1f} MB economizados (estimativa). Por tipo: {self.blocked}"
+        )
+
+
+def enable_lean_mode(page, store: str = None, stats: LeanStats = None) -> LeanStats:
+    stats = stats if stats is not None else LeanStats()
+
+    def handle_route(route):
+        request = route.request
+        blocked = should_block(request.url, request.resource_type, store)
+        stats.record(request.resource_type, blocked)
+        if blocked:
+            route.abort()
+        else:
+            route.continue_()
+
+    page.route("**/*", handle_route)
+    return stats
+
+
+async def enable_lean_mode_async(page, store: str = None, stats: LeanStats = None) -> LeanStats:
+    stats = stats if stats is not None else LeanStats()
+
+    async def handle_route(route):
+        request = route.request
+        blocked = should_block(request.url, request.resource_type, store)
+        stats.record(request.resource_type, blocked)
+        if blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle_route)
+    return stats
@@ -0,0 +1,102 @@
+import unicodedata
+import re
+
+# Fabricantes de placas de vídeo: nome canônico -> outras grafias encontradas nos títulos
+GPU_MANUFACTURERS = {
+    "ASROCK": [],
+    "GIGABYTE": ["AORUS"],
+    "XFX": [],
+    "MSI": [],
+    "ZOTAC": [],
+    "GALAX": [],
+    "PNY": [],
+    "EVGA": [],
+    "POWER COLOR": ["POWERCOLOR"],
+    "SAPPHIRE": [],
+    "ASUS": [],
+    "INNO3D": ["INNO 3D"],
+    "COLORFUL": [],
+    "GAINWARD": [],
+    "AFOX": [],
+    "PCYES": [],
+    "PALIT": [],
+    "SPARKLE": [],
+    "BIOSTAR": [],
+    "MANLI": [],
+    "MAXSUN": [],
+    "GUNNIR": [],
+}
+
+# Sem nome conhecido no título, usa a palavra logo depois de "Placa de Video"
+FALLBACK_PATTERN = re.compile(r"Placa de Video\s+([\w\-]+)", re.IGNORECASE)
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII").upper()
+
+
+def _trie_regex(words: list[str]) -> str:
+    """
+    Monta uma alternância em forma de árvore de prefixos (ex: ASUS|ASROCK -> AS(?:US|ROCK)),
+    para que cada posição do título seja testada caractere a caractere, e não nome a nome.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        ends_here = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            # Quantificador guloso: tenta primeiro o nome mais longo
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class ManufacturerMatcher:
+    """
+    Encontra o fabricante de um título em uma única busca, com todos os nomes e apelidos
+    compilados em uma só expressão. `add` permite incluir fabricantes em tempo de execução.
+    """
+
+    def __init__(self, manufacturers: dict = None):
+        self.aliases = {}
+        self.pattern = None
+        for canonical, aliases in (manufacturers or GPU_MANUFACTURERS).items():
+            self.add(canonical, *aliases, compile_pattern=False)
+        self._compile()
+
+    def add(self, canonical: str, *aliases: str, compile_pattern: bool = True):
+        canonical = _normalize(canonical)
+        for name in (canonical, *aliases):
+            self.aliases[_normalize(name)] = canonical
+        if compile_pattern:
+            self._compile()
+
+    def _compile(self):
+        # Nome inteiro: não casa "MSI" dentro de outra palavra
+        self.pattern = re.compile(r"(?<![A-Z0-9])(" + _trie_regex(list(self.aliases)) + r")(?![A-Z0-9])")
+
+    def find(self, title: str) -> str:
+        """Nome canônico do primeiro fabricante citado no título, ou None."""
+        match = self.pattern.search(_normalize(title))
+        return self.aliases[match.group(1)] if match else None
+
+
+default_manufacturer_matcher = ManufacturerMatcher()
+
+
+def extract_manufacturer(title: str, matcher: ManufacturerMatcher = None) -> str:
+    manufacturer = (matcher or default_manufacturer_matcher).find(title)
+    if manufacturer:
+        return manufacturer
+    fallback = FALLBACK_PATTERN.search(_normalize(title))
+    return fallback.group(1) if fallback else "N/A"
@@ -0,0 +1,201 @@
+from contextlib import contextmanager
+from datetime import datetime
+import threading
+import json
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import METRICS_DIR, today
+
+logger = get_logger()
+
+# Bytes transferidos pela página: documento + recursos, segundo a Resource Timing API do navegador
+PAGE_BYTES_JS = """
+() => performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || entry.encodedBodySize || 0), 0)
+"""
+
+# Métricas por página e a descrição exportada no HELP do Prometheus
+PAGE_FIELDS = {
+    "navigation_seconds": "Latência da navegação até os cards aparecerem",
+    "dom_extraction_seconds": "Tempo lendo os cards do DOM (ou do HTML)",
+    "parsing_seconds": "Tempo convertendo os cards em registros (scraper_utils)",
+    "products_found": "Cards encontrados na página",
+    "products_parsed": "Cards convertidos em registros",
+    "failed_cards": "Cards que falharam na conversão",
+    "bytes_transferred": "Bytes transferidos para carregar a página",
+}
+
+# Métrica por loja/categoria no modo http_first (ver scrape_with_fallback em http_extract.py)
+JOB_SECONDS_HELP = "Latência da loja/categoria pelo caminho usado (http ou browser, com a tentativa HTTP)"
+
+
+class ScrapeMetrics:
+    """
+    Contadores e tempos por loja, categoria e página de listagem, acumulados durante a
+    execução e exportados ao final em formato Prometheus (textfile) e em um resumo JSON.
+    """
+
+    def __init__(self):
+        self._pages = {}  # (loja, categoria, página) -> {métrica: valor}
+        self._jobs = {}  # (loja, categoria) -> {"path": caminho usado, "seconds": latência}
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def reset(self):
+        with self._lock:
+            self._pages.clear()
+            self._jobs.clear()
+        self.started_at = datetime.now()
+
+    def add(self, store: str, product_type: str, page: int, **values):
+        """Soma `values` (ver PAGE_FIELDS) às métricas da página."""
+        key = (store, product_type.upper(), int(page))
+        with self._lock:
+            entry = self._pages.setdefault(key, dict.fromkeys(PAGE_FIELDS, 0))
+            for field, value in values.items():
+                entry[field] += value or 0
+
+    def record_path(self, store: str, product_type: str, path: str, seconds: float):
+        """Registra por qual caminho (http ou browser) a loja/categoria foi extraída e em quanto tempo."""
+        with self._lock:
+            self._jobs[(store, product_type.upper())] = {"path": path, "seconds": seconds}
+
+    def discard(self, store: str, product_type: str):
+        """Descarta as métricas de página de uma loja/categoria (ex: uma tentativa HTTP abandonada)."""
+        product_type = product_type.upper()
+        with self._lock:
+            for key in [key for key in self._pages if key[:2] == (store, product_type)]:
+                del self._pages[key]
+
+    @contextmanager
+    def timer(self, store: str, product_type: str, page: int, field: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(store, product_type, page, **{field: time.perf_counter() - started})
+
+    def rows(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"store": store, "product_type": product_type, "page": page, **values}
+                for (store, product_type, page), values in sorted(self._pages.items())
+            ]
+
+    def job_rows(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"store": store, "product_type": product_type, **values}
+                for (store, product_type), values in sorted(self._jobs.items())
+            ]
+
+    def merge(self, rows: list[dict], job_rows: list[dict] = ()):
+        """Junta as métricas vindas de outro processo (ver process_pool.py)."""
+        for row in rows:
+            values = {field: row[field] for field in PAGE_FIELDS if field in row}
+            self.add(row["store"], row["product_type"], row["page"], **values)
+        for row in job_rows:
+            self.record_path(row["store"], row["product_type"], row["path"], row["seconds"])
+
+    def totals(self) -> dict:
+        """
+        Métricas somadas por loja/categoria, mais a quantidade de páginas e, no modo
+        http_first, o caminho usado e a latência dele.
+        """
+        totals = {}
+
+        def entry_of(row: dict) -> dict:
+            key = f"{row['store'].lower()}_{row['product_type'].lower()}"
+            return totals.setdefault(key, {"store": row["store"], "product_type": row["product_type"],
+                                           "pages": 0, **dict.fromkeys(PAGE_FIELDS, 0)})
+
+        for row in self.rows():
+            entry = entry_of(row)
+            entry["pages"] += 1
+            for field in PAGE_FIELDS:
+                entry[field] += row[field]
+        for row in self.job_rows():
+            entry = entry_of(row)
+            entry["path"], entry["path_seconds"] = row["path"], row["seconds"]
+        return totals
+
+    def to_prometheus(self) -> str:
+        lines = []
+        rows = self.rows()
+        for field, description in PAGE_FIELDS.items():
+            name = f"scraper_page_{field}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            for row in rows:
+                labels = f'store="{row["store"]}",product_type="{row["product_type"]}",page="{row["page"]}"'
+                lines.append(f"{name}{{{labels}}} {row[field]:g}")
+        lines.append(f"# HELP scraper_job_seconds {JOB_SECONDS_HELP}")
+        lines.append("# TYPE scraper_job_seconds gauge")
+        for row in self.job_rows():
+            labels = f'store="{row["store"]}",product_type="{row["product_type"]}",path="{row["path"]}"'
+            lines.append(f"scraper_job_seconds{{{labels}}} {row['seconds']:g}")
+        lines.append("# HELP scraper_last_run_timestamp_seconds Fim da última execução (epoch)")
+        lines.append("# TYPE scraper_last_run_timestamp_seconds gauge")
+        lines.append(f"scraper_last_run_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, run_id: str = None) -> dict:
+        return {
+            "run_id": run_id or today(),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "totals": self.totals(),
+            "pages": self.rows(),
+            "jobs": self.job_rows(),
+        }
+
+    def export(self, run_id: str = None, directory: str = METRICS_DIR) -> tuple:
+        """
+        Grava `scraper_metrics.prom` (sobrescrito a cada execução, para o textfile collector
+        do node_exporter) e `run_<run id>.json` (um por execução, para comparar execuções).
+        """
+        os.makedirs(directory, exist_ok=True)
+        prom_path = os.path.join(directory, "scraper_metrics.prom")
+        # Escreve em um arquivo temporário e renomeia, para o coletor nunca ler um arquivo pela metade
+        with open(prom_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(prom_path + ".tmp", prom_path)
+
+        summary = self.summary(run_id)
+        json_path = os.path.join(directory, f"run_{summary['run_id']}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        for key, entry in summary["totals"].items():
+            path = f", via {entry['path']} em {entry['path_seconds']:.1f}s" if "path" in entry else ""
+            logger.info(
+                f"[{key}] {entry['pages']} páginas, {entry['products_parsed']}/{entry['products_found']} cards lidos "
+                f"({entry['failed_cards']} falhas), navegação {entry['navigation_seconds']:.1f}s, "
+                f"DOM {entry['dom_extraction_seconds']:.2f}s, parsing {entry['parsing_seconds']:.2f}s, "
+                f"{entry['bytes_transferred'] / 1024:.0f} KiB{path}"
+            )
+        logger.info(f"Métricas da extração gravadas em {prom_path} e {json_path}")
+        return prom_path, json_path
+
+
+# Métricas da execução atual, compartilhadas pelos motores de extração
+METRICS = ScrapeMetrics()
+
+
+def page_bytes(page) -> int:
+    """Bytes transferidos por uma página do Playwright (0 se o navegador não informar)."""
+    try:
+        return int(page.evaluate(PAGE_BYTES_JS) or 0)
+    except Exception:
+        return 0
+
+
+async def page_bytes_async(page) -> int:
+    try:
+        return int(await page.evaluate(PAGE_BYTES_JS) or 0)
+    except Exception:
+        return 0
@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+import asyncio
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import (
+    PACING_READY_TIMEOUT_MS,
+    PACING_INITIAL_DELAY,
+    PACING_MIN_DELAY,
+    PACING_MAX_DELAY,
+    PACING_FAST_RESPONSE,
+    PACING_SLOW_RESPONSE
+)
+
+logger = get_logger()
+
+
+def wait_until_ready(page, selector: str, timeout_ms: int = PACING_READY_TIMEOUT_MS) -> bool:
+    """
+    Espera os cards da listagem aparecerem em vez de um tempo fixo.
+    Se o seletor não aparecer, espera a rede ficar ociosa antes de desistir.
+    """
+    try:
+        page.wait_for_selector(selector, timeout=timeout_ms)
+        return True
+    except Exception:
+        pass
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    except Exception as e:
+        logger.warning(f"Página não ficou pronta em {timeout_ms} ms: {e}")
+    return False
+
+
+async def wait_until_ready_async(page, selector: str, timeout_ms: int = PACING_READY_TIMEOUT_MS) -> bool:
+    try:
+        await page.wait_for_selector(selector, timeout=timeout_ms)
+        return True
+    except Exception:
+        pass
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    except Exception as e:
+        logger.warning(f"Página não ficou pronta em {timeout_ms} ms: {e}")
+    return False
+
+
+class AdaptiveRateLimiter:
+    """
+    Intervalo entre páginas de uma mesma loja que diminui aos poucos quando a loja
+    responde rápido e dobra quando há erros ou respostas lentas.
+    """
+
+    def __init__(self, initial_delay: float = PACING_INITIAL_DELAY, min_delay: float = PACING_MIN_DELAY,
+                 max_delay: float = PACING_MAX_DELAY, fast_response: float = PACING_FAST_RESPONSE,
+                 slow_response: float = PACING_SLOW_RESPONSE):
+        self.delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.fast_response = fast_response
+        self.slow_response = slow_response
+        self._last_request = None
+
+    def _remaining(self) -> float:
+        if self._last_request is None:
+            return 0.0
+        return max(0.0, self.delay - (time.monotonic() - self._last_request))
+
+    def wait(self):
+        if not _pacing_enabled:
+            return
+        remaining = self._remaining()
+        if remaining:
+            time.sleep(remaining)
+        self._last_request = time.monotonic()
+
+    async def wait_async(self):
+        if not _pacing_enabled:
+            return
+        remaining = self._remaining()
+        if remaining:
+            await asyncio.sleep(remaining)
+        self._last_request = time.monotonic()
+
+    def record(self, elapsed: float, ok: bool = True):
+        """Ajusta o intervalo a partir do tempo que a última página levou para ficar pronta."""
+        if not ok or elapsed >= self.slow_response:
+            self.delay = min(self.max_delay, self.delay * 2)
+        elif elapsed <= self.fast_response:
+            self.delay = max(self.min_delay, self.delay * 0.8)
+
+    @contextmanager
+    def track(self):
+        """Mede o bloco (navegação + espera) e registra como erro se ele lançar exceção."""
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(time.monotonic() - started, ok=False)
+            raise
+        self.record(time.monotonic() - started)
+
+
+_limiters = {}
+_pacing_enabled = True
+
+@contextmanager
+def pacing_disabled():
+    """Desliga os intervalos entre páginas (ex: reprodução de páginas gravadas, sem rede)."""
+    global _pacing_enabled
+    previous, _pacing_enabled = _pacing_enabled, False
+    try:
+        yield
+    finally:
+        _pacing_enabled = previous
+
+def rate_limiter_for(host: str) -> AdaptiveRateLimiter:
+    """Um limitador por loja, compartilhado por todos os paginadores que acessam o mesmo host."""
+    if host not in _limiters:
+        _limiters[host] = AdaptiveRateLimiter()
+    return _limiters[host]
@@ -0,0 +1,138 @@
+from multiprocessing.connection import wait
+from urllib.parse import urlparse
+import multiprocessing
+import pickle
+import time
+import zlib
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+import pandas as pd
+from src.logger import get_logger
+from src.config import ASYNC_DEFAULT_HOST_CONCURRENCY, ASYNC_HOST_CONCURRENCY, LEAN_MODE, HTTP_FAST_PATH
+from src.extraction.browser_pool import BrowserPool
+from src.extraction.checkpoint import CheckpointJournal
+from src.extraction.engine import scrape_store
+from src.extraction.http_extract import scrape_with_fallback
+from src.extraction.jobs import EXTRACTION_JOBS
+from src.extraction.metrics import METRICS
+
+logger = get_logger()
+
+# Colunas de texto repetidas em todas as linhas de um trabalho viram categorias antes de serializar
+COMPACT_COLUMNS = ["store", "product_type"]
+
+
+def frame_to_bytes(df: pd.DataFrame) -> bytes:
+    """DataFrame compacto (categorias + pickle 5 comprimido) para atravessar o limite entre processos."""
+    df = df.copy()
+    for column in COMPACT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return zlib.compress(pickle.dumps(df, protocol=5), 1)
+
+
+def frame_from_bytes(payload: bytes) -> pd.DataFrame:
+    df = pickle.loads(zlib.decompress(payload))
+    for column in COMPACT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(df[column].cat.categories.dtype)
+    return df
+
+
+def _scrape_job_worker(job: tuple, lean: bool, http_first: bool, run_id: str, conn):
+    """Executado em um processo próprio: abre o seu navegador, extrai um trabalho e devolve o DataFrame."""
+    key, store, product_type, url = job
+    # Cada processo grava o seu arquivo de checkpoint para não disputar o mesmo diário
+    checkpoint = CheckpointJournal(run_id, shard=key) if run_id else None
+    with BrowserPool(lean=lean) as pool:
+        browser_scraper = lambda: scrape_store(store, product_type, pool, checkpoint, url=url)
+        if http_first:
+            records = scrape_with_fallback(key, store, product_type, url, browser_scraper)
+        else:
+            records = browser_scraper()
+    conn.send_bytes(frame_to_bytes(pd.DataFrame(records)))
+    # Métricas deste processo, somadas às do processo principal
+    conn.send((METRICS.rows(), METRICS.job_rows()))
+    conn.close()
+
+
+def default_workers(jobs: list = EXTRACTION_JOBS) -> int:
+    return max(1, min(len(jobs), os.cpu_count() or 1))
+
+
+def run_sharded_extraction(jobs: list = EXTRACTION_JOBS, workers: int = None, lean: bool = LEAN_MODE,
+                           http_first: bool = HTTP_FAST_PATH, run_id: str = None) -> dict:
+    """
+    Executa cada trabalho (loja/categoria) em um processo separado, com no máximo `workers`
+    processos ao mesmo tempo e respeitando o limite de trabalhos simultâneos por loja
+    (ASYNC_HOST_CONCURRENCY). Se um processo morrer (ex: o navegador travar), só aquele
+    trabalho fica vazio; os outros continuam. Devolve {chave: DataFrame}.
+    """
+    workers = workers or default_workers(jobs)
+    # "spawn": o Playwright não pode ser herdado de um processo pai via fork
+    context = multiprocessing.get_context("spawn")
+    pending = list(jobs)
+    running = {}
+    results = {}
+
+    def host_of(job: tuple) -> str:
+        return urlparse(job[3]).netloc
+
+    def host_busy(job: tuple) -> bool:
+        host = host_of(job)
+        limit = ASYNC_HOST_CONCURRENCY.get(host, ASYNC_DEFAULT_HOST_CONCURRENCY)
+        return sum(1 for state in running.values() if host_of(state["job"]) == host) >= limit
+
+    logger.info(f"Extraindo {len(jobs)} trabalhos em até {workers} processos...")
+    while pending or running:
+        # Inicia os próximos trabalhos cuja loja ainda não atingiu o limite de acessos simultâneos
+        for job in list(pending):
+            if len(running) >= workers:
+                break
+            if host_busy(job):
+                continue
+            pending.remove(job)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_scrape_job_worker, name=f"scraper-{job[0]}",
+                                      args=(job, lean, http_first, run_id, sender), daemon=True)
+            process.start()
+            sender.close()
+            running[job[0]] = {"job": job, "process": process, "conn": receiver,
+                               "payload": None, "started": time.monotonic()}
+            logger.info(f"[{job[0]}] Processo {process.pid} iniciado.")
+
+        # O resultado precisa ser lido antes do fim do processo (ele bloqueia até o envio terminar)
+        waitables = {}
+        for key, state in running.items():
+            if state["payload"] is None:
+                waitables[state["conn"]] = key
+            waitables[state["process"].sentinel] = key
+        for ready in wait(list(waitables)):
+            key = waitables[ready]
+            state = running.get(key)
+            if state is None:
+                continue
+            if state["payload"] is None and (ready is state["conn"] or state["conn"].poll()):
+                try:
+                    state["payload"] = state["conn"].recv_bytes()
+                    METRICS.merge(*state["conn"].recv())
+                except (EOFError, OSError):
+                    state["payload"] = state["payload"] or b""
+            if state["process"].is_alive():
+                continue
+
+            state["process"].join()
+            state["conn"].close()
+            elapsed = time.monotonic() - state["started"]
+            if state["payload"]:
+                results[key] = frame_from_bytes(state["payload"])
+                logger.info(f"[{key}] {len(results[key])} produtos em {elapsed:.1f}s "
+                            f"({len(state['payload']) / 1024:.0f} KiB serializados).")
+            else:
+                logger.error(f"[{key}] Processo terminou sem resultado (código {state['process'].exitcode}).")
+                results[key] = pd.DataFrame()
+            del running[key]
+
+    return {key: results[key] for key, _, _, _ in jobs}
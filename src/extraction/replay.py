@@ -0,0 +1,165 @@
+from contextlib import contextmanager
+import argparse
+import json
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import SNAPSHOT_DIR
+from src.extraction.browser_pool import BrowserPool, borrow_pool
+from src.extraction.bulk_extract import BULK_EXTRACT_JS
+from src.extraction.metrics import PAGE_BYTES_JS
+from src.extraction.http_extract import parse_cards_html, count_pages_html
+from src.extraction.pacing import wait_until_ready, pacing_disabled
+from src.extraction.jobs import EXTRACTION_JOBS
+from src.extraction.engine import scrape_store
+from src.extraction.store_specs import STORE_SPECS, PAGE_COUNT_JS, page_url, last_page
+
+logger = get_logger()
+
+INDEX_FILE = "index.json"
+
+
+def snapshot_path(store: str, product_type: str, page_number: int) -> str:
+    return os.path.join(store.lower(), product_type.lower(), f"page_{page_number}.html")
+
+
+def record_snapshots(snapshot_dir: str = SNAPSHOT_DIR, pool: BrowserPool = None, max_pages: int = 3) -> dict:
+    """Grava o HTML das listagens de cada loja/categoria e um índice url -> arquivo."""
+    index = {}
+    with borrow_pool(pool) as browser_pool:
+        for key, store, product_type, url in EXTRACTION_JOBS:
+            page_number, final_page = 1, 1
+            while page_number <= final_page:
+                listing_url = page_url(store, url, page_number)
+                pagination = STORE_SPECS[store]["pagination"]
+                try:
+                    with browser_pool.page(store) as page:
+                        page.goto(listing_url, timeout=60000)
+                        wait_until_ready(page, STORE_SPECS[store]["card"])
+                        html = page.content()
+                        if pagination and page_number == 1:
+                            final_page = last_page(store, page.evaluate(PAGE_COUNT_JS, pagination["param"]), max_pages)
+                except Exception as e:
+                    logger.error(f"Erro ao gravar {listing_url}: {e}")
+                    break
+
+                relative = snapshot_path(store, product_type, page_number)
+                os.makedirs(os.path.dirname(os.path.join(snapshot_dir, relative)), exist_ok=True)
+                with open(os.path.join(snapshot_dir, relative), "w", encoding="utf-8") as f:
+                    f.write(html)
+                index[listing_url] = relative
+                logger.info(f"[{key}] Página gravada: {relative}")
+                page_number += 1
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(os.path.join(snapshot_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    return index
+
+
+def load_snapshot_index(snapshot_dir: str = SNAPSHOT_DIR) -> dict:
+    with open(os.path.join(snapshot_dir, INDEX_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FilePage:
+    """
+    Página que responde a partir dos arquivos gravados, com a mesma interface usada
+    pelos scrapers (goto, waits, evaluate). Os scripts de extração são executados em
+    Python sobre o HTML, então nada depende de rede ou de navegador.
+    """
+
+    def __init__(self, snapshot_dir: str, index: dict):
+        self.snapshot_dir = snapshot_dir
+        self.index = index
+        self.html = None
+        self.url = None
+
+    def goto(self, url: str, timeout: int = None, wait_until: str = None):
+        relative = self.index.get(url)
+        if relative is None:
+            raise FileNotFoundError(f"Nenhuma página gravada para {url}")
+        with open(os.path.join(self.snapshot_dir, relative), encoding="utf-8") as f:
+            self.html = f.read()
+        self.url = url
+
+    def wait_for_selector(self, selector: str, timeout: int = None):
+        return None
+
+    def wait_for_load_state(self, state: str = None, timeout: int = None):
+        return None
+
+    def route(self, pattern, handler):
+        return None
+
+    def content(self) -> str:
+        return self.html
+
+    def evaluate(self, script: str, arg=None):
+        if script == BULK_EXTRACT_JS:
+            card_selector = arg[0]
+            stores = [name for name, spec in STORE_SPECS.items() if spec["card"] == card_selector]
+            if not stores:
+                raise ValueError(f"Seletor de card sem loja em STORE_SPECS: {card_selector!r}")
+            return parse_cards_html(self.html, stores[0])
+        if script == PAGE_COUNT_JS:
+            # Limita ao número de páginas gravadas dessa listagem
+            base_url = self.url.split("?")[0]
+            recorded = sum(1 for url in self.index if url.split("?")[0] == base_url)
+            return min(count_pages_html(self.html, arg), recorded)
+        if script == PAGE_BYTES_JS:
+            return len(self.html.encode("utf-8"))
+        # Só os scripts de extração conhecidos (BULK_EXTRACT_JS, PAGE_COUNT_JS e PAGE_BYTES_JS) têm reprodução
+        script_name = script.strip().splitlines()[0][:80] if script.strip() else ""
+        raise ValueError(f"FilePage não reproduz o script {script_name!r} (página gravada de {self.url})")
+
+    def close(self):
+        self.html = None
+
+
+class ReplayPool:
+    """Substitui o BrowserPool nos scrapers, entregando FilePages em vez de abas do Chromium."""
+
+    def __init__(self, snapshot_dir: str = SNAPSHOT_DIR):
+        self.snapshot_dir = snapshot_dir
+        self.index = load_snapshot_index(snapshot_dir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+    @contextmanager
+    def page(self, store: str = None):
+        page = FilePage(self.snapshot_dir, self.index)
+        try:
+            yield page
+        finally:
+            page.close()
+
+
+def replay_scrapers(snapshot_dir: str = SNAPSHOT_DIR) -> dict:
+    """Executa os scrapers reais contra as páginas gravadas, sem rede e sem intervalos."""
+    pool = ReplayPool(snapshot_dir)
+    with pacing_disabled():
+        return {
+            key: scrape_store(store, product_type, pool, url=url)
+            for key, store, product_type, url in EXTRACTION_JOBS
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grava ou reproduz páginas de listagem das lojas")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        index = record_snapshots(args.dir)
+        print(f"{len(index)} páginas gravadas em {args.dir}")
+    else:
+        for key, items in replay_scrapers(args.dir).items():
+            print(f"{key}: {len(items)} produtos")
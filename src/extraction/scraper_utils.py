@@ -1,90 +1,32 @@
 import re
 import unicodedata
 from datetime import datetime
+from src.extraction.manufacturers import extract_manufacturer
 
 def normalize_text(text: str) -> str:
     return unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
 
-def extract_parcel_info_kabum(item: str) -> tuple[str, str]:
-    try:
-        installments_div = item.query_selector(".priceTextCard")
-        if not installments_div:
-            return {"installments": None, "installment_price": None}
+INSTALLMENT_PATTERN = re.compile(r"(\d+)\s*x\s*de\s*R\$\s*([\d.,]+)", re.IGNORECASE)
 
-        # Pega o <b> que contém algo como "10x de R$ 59,78"
-        installments_b = installments_div.query_selector("b")
-        if not installments_b:
-            return {"installments": None, "installment_price": None}
-
-        b_text = installments_b.inner_text().strip()  # Ex: "10x de R$ 59,78"
-
-        match = re.search(r"(\d+)\s*x\s*de\s*R\$\s*([\d.,]+)", b_text, re.IGNORECASE)
-        if match:
-            installments = int(match.group(1))
-            installment_price = float(match.group(2).replace(".", "").replace(",", "."))
-        else:
-            installments = None
-            installment_price = None
-
-        return {
-            "installments": installments,
-            "installment_price": installment_price
-        }
-
-    except Exception as e:
-        print(f"Erro ao extrair preço parcelado da Kabum: {e}")
+def parse_installment_text(text: str) -> dict:
+    """Converte um texto como "10x de R$ 59,78" em número de parcelas e valor da parcela."""
+    match = INSTALLMENT_PATTERN.search(text or "")
+    if not match:
         return {"installments": None, "installment_price": None}
+    return {
+        "installments": int(match.group(1)),
+        "installment_price": float(match.group(2).replace(".", "").replace(",", "."))
+    }
+
+def parse_installments_terabyte(installments_text: str, price_text: str) -> dict:
+    """A Terabyte separa as parcelas (ex: "12x") e o valor (ex: "R$ 74,01") em dois spans."""
+    installments = int(re.search(r"\d+", installments_text.strip()).group())
+    installment_price = float(price_text.strip().replace("R$", "").replace(".", "").replace(",", "."))
+    return {
+        "installments": installments if installments else None,
+        "installment_price": installment_price if installment_price else None
+    }
 
-def extract_parcel_info_pichau(item: str) -> tuple[str, str]:
-    try:
-        installments_div = item.query_selector(".mui-144008r-mainWrapper")
-
-        installments_p = installments_div.query_selector("p")
-
-        p_text = installments_p.inner_text().strip()
-
-        match = re.search(r"(\d+)\s*x\s*de\s*R\$\s*([\d.,]+)", p_text, re.IGNORECASE)
-        if match:
-            installments = int(match.group(1))
-            installment_price = float(match.group(2).replace(".", "").replace(",", "."))
-        else:
-            print("Não foi possível extrair os dados.")
-        return {
-            "installments": installments if installments else None,
-            "installment_price": installment_price if installment_price else None
-        }
-
-    except Exception as e:
-        print(f"Error extracting installment information: {e}")
-        return {"installments": None, "installment_price": None}
-    
-def extract_parcel_info_terabyte(item: str) -> tuple[str, str]:
-    try:
-        installments_div = item.query_selector(".product-item__juros")
-        if not installments_div:
-            return {"installments": None, "installment_price": None}
-
-        spans = installments_div.query_selector_all("span")
-        if len(spans) < 2:
-            return {"installments": None, "installment_price": None}
-
-        # Primeiro span: número de parcelas (ex: 12x)
-        installments_text = spans[0].inner_text().strip()
-        installments = int(re.search(r"\d+", installments_text).group())
-
-        # Segundo span: valor da parcela (ex: R$ 74,01)
-        price_text = spans[1].inner_text().strip()
-        installment_price = float(price_text.replace("R$", "").replace(".", "").replace(",", "."))
-
-        return {
-            "installments": installments if installments else None,
-            "installment_price": installment_price if installment_price else None
-        }
-
-    except Exception as e:
-        print(f"Error extracting installment information: {e}")
-        return {"installments": None, "installment_price": None}
-    
 def extract_cpu_socket(title: str) -> str:
     match = re.search(r"\b(AM3|AM4|AM5|LGA\s?\d{4})\b", title.upper())
     return match.group(1).replace(" ", "") if match else "N/A"
@@ -175,11 +117,27 @@ def extract_gpu_model_and_variant(title: str, product_brand: str) -> tuple[str,
     return model, variant
 
 def extract_gpu_manufacturer(title: str) -> str:
-    normalized_title = normalize_text(title)
-    fab_match = re.search(r"Placa de Video\s+([\w\-]+)", normalized_title, re.IGNORECASE)
-    manufacturer = fab_match.group(1) if fab_match else "N/A"
-    return manufacturer
+    # Dicionário único de fabricantes, compartilhado por todas as lojas
+    return extract_manufacturer(title)
 
 def extract_gpu_memory(title: str) -> str:
     match = re.search(r"(\d+)\s*GB", title, re.IGNORECASE)
     return match.group(1) + "GB" if match else "N/A"
+
+
+def build_raw_record(store: str, product_type: str, product_title: str, product_price_cash: str,
+                     product_link: str, product_parcel_info: dict) -> dict:
+    """
+    Monta o registro bruto de um produto a partir dos campos do card. Marca, modelo,
+    socket, fabricante e memória são derivados do título na transformação
+    (src/transform/title_columns.py), fora da sessão do navegador.
+    """
+    return {
+        "full_title": product_title,
+        "cash_price": product_price_cash,
+        "installments": product_parcel_info["installments"],
+        "installment_price": product_parcel_info["installment_price"],
+        "link": product_link,
+        "store": store,
+        "product_type": product_type
+    }
@@ -0,0 +1,173 @@
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.extraction.metrics import METRICS
+from src.extraction.scraper_utils import (
+    parse_installment_text,
+    parse_installments_terabyte,
+    build_raw_record
+)
+
+logger = get_logger()
+
+NO_INSTALLMENTS = {"installments": None, "installment_price": None}
+
+
+def installments_from_text(card: dict) -> dict:
+    """Parcelamento em um único texto, ex: "10x de R$ 59,78"."""
+    parcel_info = parse_installment_text(card["installment_text"])
+    return {
+        "installments": parcel_info["installments"] or None,
+        "installment_price": parcel_info["installment_price"] or None
+    }
+
+
+def installments_from_spans(card: dict) -> dict:
+    """Parcelas e valor em dois spans, ex: ["12x", "R$ 74,01"]."""
+    spans = card["installment_spans"]
+    try:
+        return parse_installments_terabyte(spans[0], spans[1])
+    except Exception:
+        return dict(NO_INSTALLMENTS)
+
+
+# Maior número de página presente nos links/botões da paginação (recebe o nome do parâmetro da URL)
+PAGE_COUNT_JS = """
+(param) => {
+    let max = 1;
+    const re = new RegExp(param + "=(\\\\d+)");
+    for (const a of document.querySelectorAll(`a[href*="${param}="]`)) {
+        const m = a.getAttribute('href').match(re);
+        if (m) max = Math.max(max, parseInt(m[1], 10));
+    }
+    for (const el of document.querySelectorAll('.pagination a, .pagination li, nav[aria-label*="agina"] a')) {
+        const n = parseInt(el.innerText.trim(), 10);
+        if (!isNaN(n)) max = Math.max(max, n);
+    }
+    return max;
+}
+"""
+
+# Uma entrada por loja. Para incluir uma loja nova basta descrevê-la aqui:
+# - urls: listagem de cada tipo de produto;
+# - card / fields: seletores lidos em lote (ver bulk_extract.py). Cada campo é
+#   (seletor, atributo, todos): seletor None usa o próprio card; atributo None lê o
+#   innerText (já com strip), senão lê o atributo; todos=True devolve a lista de textos;
+# - link_prefix: prefixo dos links relativos;
+# - installments: função que converte o card em {"installments", "installment_price"};
+# - pagination: None para listagens de uma página só, ou o parâmetro da URL com o número
+#   da página, quantas abas carregar ao mesmo tempo, limite de páginas (None = todas) e
+#   quantas páginas percorrer quando a paginação não puder ser lida.
+STORE_SPECS = {
+    "Pichau": {
+        "urls": {
+            "CPU": "https://www.pichau.com.br/hardware/processadores",
+            "GPU": "https://www.pichau.com.br/hardware/placa-de-video",
+        },
+        "card": 'a[data-cy="list-product"]',
+        "fields": {
+            "title": ["h2", None, False],
+            "price": [".mui-12athy2-price_vista", None, False],
+            "link": [None, "href", False],
+            "installment_text": [".mui-144008r-mainWrapper p", None, False],
+        },
+        "link_prefix": "https://www.pichau.com.br",
+        "installments": installments_from_text,
+        "pagination": None,
+    },
+    "Kabum": {
+        "urls": {
+            "CPU": "https://www.kabum.com.br/hardware/processadores",
+            "GPU": "https://www.kabum.com.br/hardware/placa-de-video-vga",
+        },
+        "card": "a.productLink",
+        "fields": {
+            "title": ["span.nameCard", None, False],
+            "price": ["span.priceCard", None, False],
+            "link": [None, "href", False],
+            "installment_text": [".priceTextCard b", None, False],
+        },
+        "link_prefix": "https://www.kabum.com.br/",
+        "installments": installments_from_text,
+        "pagination": {"param": "page_number", "tabs": 3, "max_pages": None, "fallback_pages": 3},
+    },
+    "Terabyte": {
+        "urls": {
+            "CPU": "https://www.terabyteshop.com.br/hardware/processadores",
+            "GPU": "https://www.terabyteshop.com.br/hardware/placas-de-video",
+        },
+        "card": "div.product-item__box",
+        "fields": {
+            "title": ["a.product-item__name", None, False],
+            "price": ["div.product-item__new-price span", None, False],
+            "link": ["a.product-item__name", "href", False],
+            "installment_spans": [".product-item__juros span", None, True],
+        },
+        "link_prefix": "",
+        "installments": installments_from_spans,
+        "pagination": None,
+    },
+}
+
+
+def page_url(store: str, base_url: str, page_number: int) -> str:
+    pagination = STORE_SPECS[store]["pagination"]
+    if page_number == 1 or pagination is None:
+        return base_url
+    return f"{base_url}?{pagination['param']}={page_number}"
+
+
+def last_page(store: str, total_pages: int, max_pages: int = None) -> int:
+    pagination = STORE_SPECS[store]["pagination"]
+    if pagination is None:
+        return 1
+    max_pages = max_pages or pagination["max_pages"]
+    # Sem paginação legível, percorre um número fixo de páginas
+    last = total_pages if total_pages and total_pages > 1 else pagination["fallback_pages"]
+    return min(last, max_pages) if max_pages else last
+
+
+def card_to_record(store: str, card: dict, product_type: str) -> dict:
+    spec = STORE_SPECS[store]
+    product_title = card["title"] if card["title"] is not None else "N/A"
+    product_price_cash = card["price"] if card["price"] is not None else "N/A"
+    product_link = spec["link_prefix"] + card["link"] if card["link"] else "N/A"
+    product_parcel_info = spec["installments"](card)
+
+    return build_raw_record(store, product_type, product_title, product_price_cash, product_link, product_parcel_info)
+
+
+def page_to_records(store: str, page_number: int, cards: list, product_type: str, seen_links: set) -> list[dict]:
+    """Converte os cards de uma página; em listagens paginadas, descarta links já vistos em `seen_links`."""
+    paginated = STORE_SPECS[store]["pagination"] is not None
+    records = []
+    parsed = failed = 0
+    started = time.perf_counter()
+    for card in cards:
+        try:
+            record = card_to_record(store, card, product_type)
+        except Exception as e:
+            logger.error(f"Erro ao processar um produto na página {page_number}: {e}")
+            failed += 1
+            continue
+        parsed += 1
+        if paginated:
+            if record["link"] in seen_links:
+                continue
+            seen_links.add(record["link"])
+        records.append(record)
+    METRICS.add(store, product_type, page_number, parsing_seconds=time.perf_counter() - started,
+                products_parsed=parsed, failed_cards=failed)
+    return records
+
+
+def pages_to_records(store: str, cards_by_page: dict, product_type: str) -> list[dict]:
+    """Converte os cards na ordem das páginas; em listagens paginadas, descarta links repetidos."""
+    records = []
+    seen_links = set()
+    for page_number in sorted(cards_by_page):
+        records.extend(page_to_records(store, page_number, cards_by_page[page_number], product_type, seen_links))
+    return records
@@ -0,0 +1,138 @@
+from collections import deque
+from contextlib import nullcontext
+from queue import Queue, Full
+import threading
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.logger import get_logger
+from src.config import LEAN_MODE, HTTP_FAST_PATH, STREAM_QUEUE_SIZE, STREAM_BATCH_SIZE, STREAM_DEDUP_PAGES
+from src.extraction.browser_pool import BrowserPool
+from src.extraction.checkpoint import CheckpointJournal
+from src.extraction.engine import iter_store_pages
+from src.extraction.http_extract import iter_http_pages
+from src.extraction.jobs import EXTRACTION_JOBS
+from src.extraction.metrics import METRICS
+from src.extraction.store_specs import page_to_records
+
+logger = get_logger()
+
+_DONE = object()
+
+
+class RecentLinks:
+    """
+    Links já entregues nas últimas `pages` páginas de um trabalho, para a deduplicação de
+    page_to_records. Um produto que muda de posição durante a paginação reaparece em uma página
+    vizinha, então a janela basta e a memória não cresce com o catálogo; repetições mais
+    distantes ainda são descartadas na carga, pelo índice único do banco (ver db_schema.py).
+    """
+
+    def __init__(self, pages: int = STREAM_DEDUP_PAGES):
+        self._pages = deque(maxlen=pages)
+
+    def next_page(self):
+        self._pages.append(set())
+
+    def add(self, link):
+        self._pages[-1].add(link)
+
+    def __contains__(self, link) -> bool:
+        return any(link in page for page in self._pages)
+
+
+def _job_pages(key: str, store: str, product_type: str, url: str, pool: BrowserPool,
+               checkpoint: CheckpointJournal, http_first: bool):
+    """
+    Páginas (número, cards) de um trabalho, uma de cada vez: pelo caminho HTTP, se pedido, e
+    pelo navegador se ele falhar. Na troca, as páginas já entregues pelo HTTP não se repetem.
+    """
+    delivered = set()  # só números de página
+    if http_first:
+        try:
+            for page_number, cards in iter_http_pages(store, product_type, url):
+                delivered.add(page_number)
+                yield page_number, cards
+            logger.info(f"[{key}] {len(delivered)} páginas via http")
+            return
+        except Exception as e:
+            # O navegador lê todas as páginas de novo: as métricas do HTTP contariam em dobro
+            METRICS.discard(store, product_type)
+            logger.info(f"[{key}] Caminho HTTP indisponível ({e}). Usando o navegador.")
+
+    for page_number, cards in iter_store_pages(store, product_type, pool, checkpoint, url=url):
+        if page_number not in delivered:
+            yield page_number, cards
+
+
+def iter_job_batches(jobs: list = EXTRACTION_JOBS, lean: bool = LEAN_MODE, http_first: bool = HTTP_FAST_PATH,
+                     checkpoint: CheckpointJournal = None, batch_size: int = STREAM_BATCH_SIZE, pool: BrowserPool = None):
+    """
+    Gerador de micro-lotes (chave do trabalho, registros brutos) com até `batch_size`
+    registros, juntando páginas seguidas de um mesmo trabalho, para todos os trabalhos em
+    sequência. Um erro em uma loja/categoria encerra só aquele trabalho; os lotes já
+    entregues continuam valendo. Sem `pool`, abre um BrowserPool próprio.
+    """
+    with nullcontext(pool) if pool is not None else BrowserPool(lean=lean) as pool:
+        for key, store, product_type, url in jobs:
+            logger.info(f"Extraindo dados da {store} ({product_type}) em streaming...")
+            seen_links = RecentLinks()
+            pending = []
+            total = 0
+            try:
+                for page_number, cards in _job_pages(key, store, product_type, url, pool, checkpoint, http_first):
+                    seen_links.next_page()
+                    pending += page_to_records(store, page_number, cards, product_type, seen_links)
+                    while len(pending) >= batch_size:
+                        batch, pending = pending[:batch_size], pending[batch_size:]
+                        total += len(batch)
+                        yield key, batch
+            except Exception as e:
+                logger.error(f"Erro no scraper da {store} para o item {product_type}: {e}")
+            if pending:
+                total += len(pending)
+                yield key, pending
+            logger.info(f"[{key}] {total} produtos entregues em streaming.")
+
+
+def stream_in_background(make_batches, maxsize: int = STREAM_QUEUE_SIZE):
+    """
+    Executa o gerador criado por `make_batches()` em uma thread própria (o Playwright fica
+    todo nela) e entrega os itens por uma fila limitada: quando o consumidor atrasa, a
+    extração espera em vez de acumular páginas na memória.
+    """
+    queue = Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.5)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in make_batches():
+                if not put(item):
+                    return
+        except Exception as e:
+            logger.error(f"Erro na extração em streaming: {e}")
+        finally:
+            put(_DONE)
+
+    producer = threading.Thread(target=produce, name="stream-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Consumidor encerrado (fim ou erro): libera a thread produtora se ela estiver esperando a fila
+        stop.set()
+        producer.join()
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+import re
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.config import TITLE_PARSER_CACHE_SIZE
+from src.extraction.manufacturers import extract_manufacturer
+
+# Mesmos padrões das funções extract_* de scraper_utils, compilados uma única vez
+RX_PATTERN = re.compile(r"\brx\s?\d+")
+GTX_RTX_PATTERN = re.compile(r"\b(gtx|rtx)\s?\d+")
+SOCKET_PATTERN = re.compile(r"\b(AM3|AM4|AM5|LGA\s?\d{4})\b")
+RYZEN_MODEL_PATTERN = re.compile(r"RYZEN\s*(\d\s*)?(\d{3,5}[A-Z0-9]{0,3})")
+RYZEN_VARIANT_PATTERN = re.compile(r"(RYZEN\s*\d?)")
+CORE_ULTRA_MODEL_PATTERN = re.compile(r"CORE\sULTRA\s\d\s(\d{3,5}[A-Z]{0,2})")
+CORE_ULTRA_VARIANT_PATTERN = re.compile(r"CORE\sULTRA\s(\d)")
+CORE_I_MODEL_PATTERN = re.compile(r"I[3579][,\s-]*?(\d{4,5}[A-Z]{0,2})")
+CORE_I_VARIANT_PATTERN = re.compile(r"CORE\s(I[3579])")
+GPU_MODEL_PATTERNS = {
+    "AMD": re.compile(r"(RX\s?\d{3,4}(?:\s?(XT|XTX|GRE)?)?)"),
+    "NVIDIA": re.compile(r"((RTX|GTX|GT)\s?\d{3,4}(?:\s?(SUPER|TI)?)?)"),
+    "INTEL": re.compile(r"(ARC\s+[A-Z]?\d{3,4}(?:\s?(M|PRO|OC)?)?)"),
+}
+MEMORY_PATTERN = re.compile(r"(\d+)\s*GB", re.IGNORECASE)
+
+
+class TitleParser:
+    """
+    Extrai todos os campos de um título de uma vez, com cache LRU por título.
+    O resultado é idêntico ao das funções extract_* de scraper_utils
+    (conferido por perf/check_title_parser.py). Os dicts devolvidos são
+    compartilhados pelo cache e não devem ser alterados.
+    """
+
+    def __init__(self, cache_size: int = TITLE_PARSER_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, title: str) -> dict:
+        fields = self._cache.get(title)
+        if fields is not None:
+            self._cache.move_to_end(title)
+            self.hits += 1
+            return fields
+
+        self.misses += 1
+        fields = self._parse(title)
+        self._cache[title] = fields
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return fields
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._cache),
+        }
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _parse(self, title: str) -> dict:
+        title_lower = title.lower()
+        stripped = title.strip()
+        title_upper = title.upper()
+        stripped_upper = stripped.upper()
+
+        brand = self._brand(title_lower)
+        cpu_base_model, cpu_variant = self._cpu_model_and_variant(title_upper, brand)
+        gpu_base_model, gpu_custom_model = self._gpu_model_and_variant(stripped, stripped_upper, brand)
+
+        socket_match = SOCKET_PATTERN.search(title_upper)
+        memory_match = MEMORY_PATTERN.search(title)
+
+        return {
+            "brand": brand,
+            "socket": socket_match.group(1).replace(" ", "") if socket_match else "N/A",
+            "cpu_base_model": cpu_base_model,
+            "cpu_variant": cpu_variant,
+            "gpu_base_model": gpu_base_model,
+            "gpu_custom_model": gpu_custom_model,
+            "manufacturer": extract_manufacturer(title),
+            "vram_memory": memory_match.group(1) + "GB" if memory_match else "N/A",
+        }
+
+    @staticmethod
+    def _brand(title_lower: str) -> str:
+        if "ryzen" in title_lower or "radeon" in title_lower or RX_PATTERN.search(title_lower):
+            return "AMD"
+        if "geforce" in title_lower or GTX_RTX_PATTERN.search(title_lower):
+            return "NVIDIA"
+        if "intel" in title_lower or "core i" in title_lower or "arc" in title_lower:
+            return "INTEL"
+        return "N/A"
+
+    @staticmethod
+    def _cpu_model_and_variant(title_upper: str, brand: str) -> tuple[str, str]:
+        base_model = "N/A"
+        variant = "N/A"
+
+        if brand == "AMD":
+            match = RYZEN_MODEL_PATTERN.search(title_upper)
+            if match:
+                base_model = match.group(2).strip()
+                pre_match = RYZEN_VARIANT_PATTERN.search(title_upper)
+                if pre_match:
+                    variant = pre_match.group(0).strip()
+
+        elif brand == "INTEL":
+            match = CORE_ULTRA_MODEL_PATTERN.search(title_upper)
+            if match:
+                base_model = match.group(1).strip()
+                variant_match = CORE_ULTRA_VARIANT_PATTERN.search(title_upper)
+                if variant_match:
+                    variant = f"ULTRA {variant_match.group(1)}"
+            else:
+                match = CORE_I_MODEL_PATTERN.search(title_upper)
+                if match:
+                    base_model = match.group(1).strip()
+                    variant_match = CORE_I_VARIANT_PATTERN.search(title_upper)
+                    if variant_match:
+                        variant = variant_match.group(1)
+
+        return base_model, variant
+
+    @staticmethod
+    def _gpu_model_and_variant(original_title: str, title_upper: str, brand: str) -> tuple[str, str]:
+        pattern = GPU_MODEL_PATTERNS.get(brand)
+        match = pattern.search(title_upper) if pattern else None
+        if not match:
+            return "Unknown model", original_title
+
+        model = match.group(1).replace("  ", " ").strip()
+        after_model = original_title[match.end():].strip()
+        variant = after_model.split(',')[0].strip(" -–").strip()
+        return model, variant
+
+
+default_title_parser = TitleParser()
+
+def parse_title(title: str) -> dict:
+    return default_title_parser.parse(title)
@@ -0,0 +1,127 @@
+import threading
+import time
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+from src.config import DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_PRE_PING, DB_POOL_RECYCLE
+
+# Um engine (e o seu pool de conexões) por processo e por URL, criado no primeiro uso.
+# As funções de carga do pipeline e as consultas do dashboard reaproveitam as mesmas conexões.
+_engines = {}
+_lock = threading.Lock()
+
+
+class PoolStats:
+    """Contadores do pool de um engine: conexões abertas, empréstimos e quanto tempo cada um levou."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections_opened = 0
+            self.connect_seconds = 0.0
+            self.checkouts = 0
+            self.checkout_seconds = 0.0
+            self.max_checkout_seconds = 0.0
+            self.invalidated = 0
+
+    def attach(self, engine):
+        """Registra os eventos do engine que alimentam os contadores."""
+        pending = threading.local()
+
+        @event.listens_for(engine, "do_connect")
+        def _before_connect(dialect, conn_rec, cargs, cparams):
+            pending.started = time.perf_counter()
+
+        @event.listens_for(engine.pool, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            elapsed = time.perf_counter() - getattr(pending, "started", time.perf_counter())
+            with self._lock:
+                self.connections_opened += 1
+                self.connect_seconds += elapsed
+
+        @event.listens_for(engine.pool, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info["checked_out_at"] = time.perf_counter()
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine.pool, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            started = connection_record.info.pop("checked_out_at", None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.checkout_seconds += elapsed
+                self.max_checkout_seconds = max(self.max_checkout_seconds, elapsed)
+
+        @event.listens_for(engine.pool, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidated += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "connections_opened": self.connections_opened,
+                "avg_connect_ms": round(1000 * self.connect_seconds / self.connections_opened, 2) if self.connections_opened else 0.0,
+                "checkouts": self.checkouts,
+                # Empréstimos atendidos por uma conexão que já estava aberta no pool
+                "reused_checkouts": max(self.checkouts - self.connections_opened, 0),
+                # Tempo entre o empréstimo e a devolução de cada conexão
+                "avg_checkout_ms": round(1000 * self.checkout_seconds / self.checkouts, 2) if self.checkouts else 0.0,
+                "max_checkout_ms": round(1000 * self.max_checkout_seconds, 2),
+                "invalidated": self.invalidated,
+            }
+
+
+def _pool_options(url: str) -> dict:
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    # O SQLite em memória usa um pool de uma conexão por thread, sem tamanho configurável
+    database = make_url(url)
+    if database.get_backend_name() != "sqlite" or database.database not in (None, "", ":memory:"):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+
+def get_engine(url: str):
+    """
+    Engine compartilhado do processo para `url`, criado na primeira chamada. Em um processo
+    filho (fork) o pool herdado é descartado sem fechar as conexões do pai e um novo é criado.
+    """
+    with _lock:
+        entry = _engines.get(url)
+        if entry is not None and entry[1] != os.getpid():
+            entry[0].dispose(close=False)
+            entry = None
+        if entry is None:
+            engine = create_engine(url, **_pool_options(url))
+            stats = PoolStats()
+            stats.attach(engine)
+            entry = _engines[url] = (engine, os.getpid(), stats)
+        return entry[0]
+
+
+def pool_stats(url: str) -> dict:
+    """Contadores do pool do engine de `url` e o estado atual do pool (vazio se o engine não foi criado)."""
+    entry = _engines.get(url)
+    if entry is None:
+        return {}
+    engine, _, counters = entry
+    stats = counters.as_dict()
+    stats["pool_status"] = engine.pool.status()
+    return stats
+
+
+def dispose_engine(url: str = None):
+    """Fecha as conexões do engine de `url` (ou de todos) e o remove; o próximo uso cria outro."""
+    with _lock:
+        for key in [url] if url is not None else list(_engines):
+            entry = _engines.pop(key, None)
+            if entry is not None:
+                entry[0].dispose()
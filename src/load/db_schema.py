@@ -0,0 +1,229 @@
+import threading
+
+import pandas as pd
+from sqlalchemy import BigInteger, Boolean, Column, Date, Double, Identity, Integer, MetaData, SmallInteger, Table, Text, false, inspect, text
+
+from src.logger import get_logger
+from src.transform.product_key import KEY_COLUMNS, add_product_key
+from src.transform.title_columns import CPU_COLUMNS, GPU_COLUMNS
+
+logger = get_logger()
+
+# Colunas das tabelas de preços (cpus, gpus), na ordem dos CSVs processados; as que não
+# aparecem em COLUMN_TYPES são texto. Além delas, cada tabela tem as colunas de controle
+# INTERNAL_COLUMNS: a chave substituta "id" e a marca das repetições antigas da deduplicação.
+TABLE_COLUMNS = {
+    "CPU": CPU_COLUMNS + ["product_key", "extraction_date"],
+    "GPU": GPU_COLUMNS + ["product_key", "extraction_date"],
+}
+COLUMN_TYPES = {"cash_price": Double, "installment_price": Double, "installments": SmallInteger, "extraction_date": Date}
+LEGACY_DUPLICATE_COLUMN = "is_legacy_duplicate"
+INTERNAL_COLUMNS = ["id", LEGACY_DUPLICATE_COLUMN]
+
+# Uma mesma loja não grava duas vezes o mesmo produto (link) pelo mesmo preço no mesmo dia;
+# produtos diferentes com o mesmo modelo e preço são linhas diferentes
+DEDUP_KEY = ['extraction_date', 'store', 'link', 'base_model', 'cash_price']
+NULLABLE_KEY_COLUMNS = {'link', 'base_model'}
+DEDUP_INDEX = "{table}_offer_key"
+# Índices únicos anteriores, substituídos na migração: o da chave sem o link e o que
+# listava os ids das repetições antigas na própria definição
+LEGACY_DEDUP_INDEXES = ["{table}_dedup_key", "{table}_unique_offer"]
+
+# Índices das consultas do dashboard: a extração mais recente (MAX e igualdade na data) e o
+# histórico de um modelo, pelo nome da loja (base_model) ou pela chave canônica, já em ordem de data
+QUERY_INDEXES = {
+    "extraction_date": ["extraction_date"],
+    "base_model_date": ["base_model", "extraction_date"],
+    "product_key_date": ["product_key", "extraction_date"],
+}
+
+# Tabelas já verificadas por ensure_schema neste processo, por banco (URL) e nome: as
+# gravações seguintes não consultam o catálogo de novo
+_ready = set()
+_lock = threading.Lock()
+
+
+def product_type_of(columns) -> str:
+    return 'CPU' if 'variant' in columns else 'GPU'
+
+
+def managed_table(table_name: str, product_type: str, extra_columns=()) -> Table:
+    """
+    Definição da tabela de uma categoria. Colunas fora de TABLE_COLUMNS (ex: de uma tabela
+    antiga ou de um scraper novo) entram como texto, depois das conhecidas.
+    """
+    names = TABLE_COLUMNS[product_type]
+    names = names + [name for name in extra_columns if name not in names and name not in INTERNAL_COLUMNS]
+    return Table(
+        table_name, MetaData(),
+        # INTEGER PRIMARY KEY no SQLite (o próprio rowid); identidade BIGINT no PostgreSQL
+        Column('id', BigInteger().with_variant(Integer, 'sqlite'), Identity(), primary_key=True),
+        *[Column(name, COLUMN_TYPES.get(name, Text)()) for name in names],
+        Column(LEGACY_DUPLICATE_COLUMN, Boolean(), nullable=False, server_default=false()),
+    )
+
+
+def _index_names(connection, table_name: str) -> set:
+    # Sem refletir os índices: o SQLAlchemy não reflete os de expressão (como o de deduplicação)
+    if connection.dialect.name == "sqlite":
+        query = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"
+    else:
+        query = "SELECT indexname FROM pg_indexes WHERE tablename = :table"
+    return {row[0] for row in connection.execute(text(query), {'table': table_name})}
+
+
+def _python_type(column_type):
+    try:
+        return column_type.python_type
+    except NotImplementedError:
+        return None
+
+
+def ensure_product_key_column(engine, table_name: str):
+    """
+    Tabelas criadas antes da chave canônica: acrescenta a coluna product_key e a preenche
+    a partir dos modelos distintos já gravados (uma atualização por modelo, não por linha).
+    """
+    columns = {column['name'] for column in inspect(engine).get_columns(table_name)}
+    if 'product_key' in columns:
+        return
+    product_type = product_type_of(columns)
+    key_columns = KEY_COLUMNS[product_type]
+
+    with engine.begin() as connection:
+        connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN product_key TEXT"))
+        models = pd.read_sql_query(text(f"SELECT DISTINCT {', '.join(key_columns)} FROM {table_name}"), connection)
+        models = add_product_key(models, product_type).dropna(subset=['product_key'])
+        if not models.empty:
+            condition = " AND ".join(f"{column} = :{column}" for column in key_columns)
+            connection.execute(text(f"UPDATE {table_name} SET product_key = :product_key WHERE {condition}"),
+                               models.to_dict('records'))
+    logger.info(f"Coluna product_key criada na tabela '{table_name}' ({len(models)} modelos preenchidos)")
+
+
+def _rebuild_sqlite(connection, table_name: str, managed: Table, columns: list):
+    """O SQLite não altera tipos nem cria chave primária em uma tabela existente: copia para uma nova."""
+    rebuilt = managed.to_metadata(MetaData(), name=f"{table_name}_migrating")
+    rebuilt.create(connection)
+    names = ", ".join(columns)
+    connection.execute(text(f"INSERT INTO {rebuilt.name} ({names}) SELECT {names} FROM {table_name} ORDER BY rowid"))
+    connection.execute(text(f"DROP TABLE {table_name}"))
+    connection.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {table_name}"))
+
+
+def _cast(engine, column: Column) -> str:
+    sql_type = column.type.compile(dialect=engine.dialect)
+    if column.type.python_type is int:
+        # Parcelas gravadas como float (8.0) ou texto ("8")
+        return f"CAST(ROUND(CAST({column.name} AS NUMERIC)) AS {sql_type})"
+    return f"CAST({column.name} AS {sql_type})"
+
+
+def ensure_managed_columns(engine, table_name: str):
+    """
+    Tabelas criadas pelo to_sql do pandas: acrescenta a chave substituta "id" e corrige as
+    colunas com outro tipo (ex: a data gravada como texto). No PostgreSQL com ALTER TABLE;
+    no SQLite a tabela é recriada.
+    """
+    existing = inspect(engine).get_columns(table_name)
+    names = [column['name'] for column in existing]
+    managed = managed_table(table_name, product_type_of(names), names)
+    retyped = [managed.c[column['name']] for column in existing
+               if column['name'] != 'id' and _python_type(column['type']) is not managed.c[column['name']].type.python_type]
+    missing_id = 'id' not in names
+    if not retyped and not missing_id:
+        return
+
+    with engine.begin() as connection:
+        if engine.dialect.name == "sqlite":
+            _rebuild_sqlite(connection, table_name, managed, [name for name in names if name != 'id'])
+        else:
+            for column in retyped:
+                sql_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column.name} TYPE {sql_type} USING {_cast(engine, column)}"))
+            if missing_id:
+                # As linhas existentes recebem ids na ordem física da tabela
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"))
+    changes = [f"{column.name} -> {column.type.compile(dialect=engine.dialect)}" for column in retyped]
+    logger.info(f"Tabela '{table_name}' migrada: {', '.join((['chave id'] if missing_id else []) + changes)}")
+
+
+def ensure_dedup_index(engine, table_name: str):
+    """
+    Índice único na chave de deduplicação (DEDUP_KEY), o que permite inserir com
+    ON CONFLICT DO NOTHING. base_model e link nulos contam como um valor. Nenhuma linha
+    já gravada é apagada: se a tabela tiver repetições antigas da chave, a primeira de cada
+    uma fica no índice e as demais são marcadas uma única vez em LEGACY_DUPLICATE_COLUMN e
+    ficam de fora (índice parcial), então novas gravações continuam deduplicadas contra
+    todo o histórico.
+    """
+    index_name = DEDUP_INDEX.format(table=table_name)
+    columns = ", ".join(f"COALESCE({column}, '')" if column in NULLABLE_KEY_COLUMNS else column for column in DEDUP_KEY)
+    with engine.begin() as connection:
+        existing = _index_names(connection, table_name)
+        if index_name in existing:
+            return
+        for legacy in LEGACY_DEDUP_INDEXES:
+            if legacy.format(table=table_name) in existing:
+                connection.execute(text(f"DROP INDEX {legacy.format(table=table_name)}"))
+        if LEGACY_DUPLICATE_COLUMN not in {column['name'] for column in inspect(connection).get_columns(table_name)}:
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {LEGACY_DUPLICATE_COLUMN} BOOLEAN NOT NULL DEFAULT FALSE"))
+        # Cópias repetidas já gravadas: todas menos a primeira de cada chave
+        repeated = connection.execute(text(f"""
+            UPDATE {table_name} SET {LEGACY_DUPLICATE_COLUMN} = TRUE WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY {columns} ORDER BY id) AS n
+                    FROM {table_name} WHERE NOT {LEGACY_DUPLICATE_COLUMN}
+                ) ranked WHERE n > 1
+            )
+        """)).rowcount
+        if repeated:
+            logger.warning(f"Tabela '{table_name}': {repeated} linhas antigas repetem a chave de deduplicação; "
+                           f"foram mantidas, marcadas em {LEGACY_DUPLICATE_COLUMN} e ficam fora do índice único")
+        connection.execute(text(f"CREATE UNIQUE INDEX {index_name} ON {table_name} ({columns}) "
+                                f"WHERE NOT {LEGACY_DUPLICATE_COLUMN}"))
+    logger.info(f"Índice único '{index_name}' criado")
+
+
+def ensure_query_indexes(engine, table_name: str):
+    """Cria os índices de QUERY_INDEXES que ainda não existem na tabela."""
+    with engine.begin() as connection:
+        missing = {f"{table_name}_{suffix}": columns for suffix, columns in QUERY_INDEXES.items()
+                   if f"{table_name}_{suffix}" not in _index_names(connection, table_name)}
+        for index_name, columns in missing.items():
+            connection.execute(text(f"CREATE INDEX {index_name} ON {table_name} ({', '.join(columns)})"))
+    if missing:
+        logger.info(f"Índices criados na tabela '{table_name}': {', '.join(missing)}")
+
+
+def ensure_schema(engine, table_name: str, columns=()):
+    """
+    Garante a tabela de preços no formato atual: cria a tabela (com os tipos de
+    TABLE_COLUMNS, a chave substituta e os índices) se ela ainda não existir, ou migra uma
+    tabela antiga. Cada passo verifica o estado do banco antes e não faz nada se já estiver
+    aplicado; depois da primeira chamada bem-sucedida a tabela fica marcada como pronta e as
+    seguintes não vão ao banco. `columns` são as colunas do DataFrame a gravar, usadas para
+    criar a tabela; sem elas uma tabela inexistente continua inexistente.
+    """
+    key = (engine.url, table_name)
+    if key in _ready:
+        return
+    with _lock:
+        if key in _ready:
+            return
+        if not inspect(engine).has_table(table_name):
+            if not len(columns):
+                return
+            managed_table(table_name, product_type_of(columns), columns).create(engine)
+            logger.info(f"Tabela '{table_name}' criada")
+        else:
+            ensure_product_key_column(engine, table_name)
+            ensure_managed_columns(engine, table_name)
+        ensure_dedup_index(engine, table_name)
+        ensure_query_indexes(engine, table_name)
+        _ready.add(key)
+
+
+def forget_schema(engine, table_name: str):
+    """Esquece que a tabela está pronta (ex: depois de apagá-la); a próxima gravação verifica de novo."""
+    _ready.discard((engine.url, table_name))
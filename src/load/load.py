@@ -1,8 +1,15 @@
 import pandas as pd
+import io
 import os
 from src.logger import get_logger
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import Date, column, table, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from dotenv import load_dotenv
+from src.transform.schema import restore_schema, to_storage
+from src.load.db_engine import get_engine, pool_stats
+from src.load.db_schema import INTERNAL_COLUMNS, ensure_schema
+from src.config import DB_INSERT_BATCH_SIZE, DB_LOAD_METHOD
 
 load_dotenv()
 
@@ -12,11 +19,43 @@ DB_HOST = os.getenv("POSTGRESQL_HOST")
 DB_PORT = os.getenv("POSTGRESQL_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Consultas do dashboard, atendidas pelos índices de QUERY_INDEXES (src/load/db_schema.py).
+# São só leituras: o esquema é migrado pelo pipeline (migrate_database), não pelo dashboard.
+# A data mais recente vem do fim do índice de extraction_date, e as linhas dela do mesmo índice
+LATEST_QUERY = "SELECT * FROM {table} WHERE extraction_date = (SELECT MAX(extraction_date) FROM {table})"
+HISTORY_QUERY = """
+    SELECT extraction_date, cash_price, store
+    FROM {table}
+    WHERE product_key = :product_key
+    ORDER BY extraction_date
+"""
 
 logger = get_logger()
 
+
+def database_pool_stats() -> dict:
+    """Conexões abertas, empréstimos e tempos do pool compartilhado do banco (ver db_engine.py)."""
+    return pool_stats(DATABASE_URL)
+
+
+def migrate_database(table_names) -> bool:
+    """
+    Cria ou migra as tabelas de preços (ensure_schema) uma vez, antes das gravações; as
+    gravações seguintes do processo já encontram as tabelas marcadas como prontas.
+    Devolve False se o banco não pôde ser migrado (o erro fica no log).
+    """
+    try:
+        engine = get_engine(DATABASE_URL)
+        for table_name in table_names:
+            ensure_schema(engine, table_name)
+        return True
+    except Exception as e:
+        logger.error(f"Error migrating database tables: {e}")
+        return False
+
+
 def save_to_csv(df: pd.DataFrame, path: str):
     if df.empty:
         logger.warning("Empty DataFrame. No data will be saved.")
@@ -30,61 +69,128 @@ def save_to_csv(df: pd.DataFrame, path: str):
         logger.error(f"Error saving file in {path}: {e}") 
 
 
-def save_to_database(df: pd.DataFrame, table_name: str):
+def append_to_csv(df: pd.DataFrame, path: str, header: bool = False):
+    """Acrescenta um micro-lote ao CSV; `header=True` recria o arquivo (primeiro lote da execução)."""
+    if df.empty:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=False, mode='w' if header else 'a', header=header)
+    except Exception as e:
+        logger.error(f"Error appending to file {path}: {e}")
+
+
+def save_to_database(df: pd.DataFrame, table_name: str, method: str = DB_LOAD_METHOD) -> tuple:
     if df.empty:
         # em ingles
         logger.warning("Empty DataFrame. No data will be saved.")
-        return
+        return 0, 0
     
-    save_to_postgresql(df, table_name)
+    return save_to_postgresql(df, table_name, method)
+
+
+def insert_new_rows(df: pd.DataFrame, table_name: str, batch_size: int = DB_INSERT_BATCH_SIZE) -> tuple:
+    """
+    Insere `df` em lotes de INSERT ... ON CONFLICT DO NOTHING: a deduplicação acontece no
+    banco, pelo índice único, e custa só o número de linhas novas (a tabela não é lida).
+    Linhas repetidas dentro do próprio `df` também são descartadas. Devolve (inseridas, ignoradas).
+    """
+    df = to_storage(df)
+    engine = get_engine(DATABASE_URL)
+    ensure_schema(engine, table_name, df.columns)
 
+    # Só as colunas do DataFrame, sem refletir a tabela; a data com o tipo Date para o driver
+    target = table(table_name, *[column(name, Date) if name == 'extraction_date' else column(name) for name in df.columns])
+    dialect_insert = sqlite_insert if engine.dialect.name == "sqlite" else postgresql_insert
+    # Valores nativos do Python (None no lugar de NaN/NA) para o driver
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
 
-def save_to_postgresql(df: pd.DataFrame, table_name: str):
+    inserted = 0
+    with engine.begin() as connection:
+        for start in range(0, len(records), batch_size):
+            statement = dialect_insert(target).values(records[start:start + batch_size]).on_conflict_do_nothing()
+            inserted += connection.execute(statement).rowcount
+    return inserted, len(records) - inserted
+
+
+# Marcador de nulo no CSV enviado ao COPY (o padrão do formato csv, campo vazio, também
+# transformaria textos vazios em NULL)
+COPY_NULL = r"\N"
+
+
+def copy_new_rows(df: pd.DataFrame, table_name: str) -> tuple:
+    """
+    Carga em massa (só PostgreSQL): o DataFrame vira um CSV em memória enviado com
+    COPY FROM STDIN para uma tabela temporária, que é mesclada na tabela final em um único
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING. Mesma deduplicação e mesmo retorno de insert_new_rows.
+    """
+    df = to_storage(df)
+    engine = get_engine(DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        raise ValueError(f"COPY só está disponível no PostgreSQL (banco atual: {engine.dialect.name})")
+    ensure_schema(engine, table_name, df.columns)
+
+    quote = engine.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(name) for name in df.columns)
+    staging = quote(f"{table_name}_staging")
+    buffer = io.StringIO()
+    # Nulos (NaN/NA) viram um marcador explícito; textos vazios continuam '' como no insert_new_rows
+    df.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+
+    connection = engine.raw_connection()
     try:
-        engine = create_engine(DATABASE_URL)
-        inspector = inspect(engine)
-        
-        # 1. Verifica se a tabela existe e obtém a última data
-        if inspector.has_table(table_name):
-            # Busca registros existentes com as mesmas datas, lojas, base_model e cash_price
-            existing_query = f"SELECT extraction_date, store, base_model, cash_price FROM {table_name}"
-            existing_df = pd.read_sql_query(existing_query, engine)
-
-            if existing_df.empty:
-                new_data = df
-            else:
-                # Converte as colunas de data para o formato adequado: YYYY-MM-DD
-                df['extraction_date'] = pd.to_datetime(df['extraction_date'], errors='coerce').dt.date
-                existing_df['extraction_date'] = pd.to_datetime(existing_df['extraction_date'], errors='coerce').dt.date
-
-                # Faz merge com base nos campos relevantes
-                merge_keys = ['extraction_date', 'store', 'base_model', 'cash_price']
-                df_merged = df.merge(existing_df, on=merge_keys, how='left', indicator=True)
-
-                new_data = df_merged[df_merged['_merge'] == 'left_only'].drop(columns=['_merge'])
-    
-        else:
-            new_data = df  # Tabela não existe (primeira inserção)
-        
-        # 2. Insere apenas dados novos
-        if not new_data.empty:
-            new_data.to_sql(
-                table_name,
-                engine,
-                index=False,
-                if_exists='append'
-            )
-            logger.info(f"Inserting {len(new_data)} records from {df['store'].iloc[0]} into table '{table_name}'")
-        else:
-            logger.info(f"No new data from {df['store'].iloc[0]} to insert into table '{table_name}'. Most recent date already exists.")
-            
+        with connection.cursor() as cursor:
+            # Só as colunas do DataFrame, com os tipos da tabela final; descartada no commit
+            cursor.execute(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {quote(table_name)} WITH NO DATA")
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buffer)
+            cursor.execute(f"INSERT INTO {quote(table_name)} ({columns}) SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING")
+            inserted = cursor.rowcount
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return inserted, len(df) - inserted
+
+
+# Formas de gravar as linhas novas (DB_LOAD_METHOD em src/config.py)
+LOADERS = {"insert": insert_new_rows, "copy": copy_new_rows}
+
+
+def save_to_postgresql(df: pd.DataFrame, table_name: str, method: str = DB_LOAD_METHOD) -> tuple:
+    try:
+        inserted, skipped = LOADERS[method](df, table_name)
+        stores = ", ".join(str(store) for store in df['store'].dropna().unique())
+        logger.info(f"Table '{table_name}' ({stores}): {inserted} records inserted, {skipped} duplicates skipped")
+        return inserted, skipped
+
     except Exception as e:
         logger.error(f"Error saving in table '{table_name}': {e}")
+        return 0, 0
+
+def append_to_database(df: pd.DataFrame, table_name: str, method: str = DB_LOAD_METHOD) -> int:
+    """
+    Insere um micro-lote com a mesma deduplicação no banco de save_to_postgresql.
+    Devolve quantas linhas foram inseridas.
+    """
+    if df.empty:
+        return 0
+    try:
+        inserted, _ = LOADERS[method](df, table_name)
+        return inserted
+
+    except Exception as e:
+        logger.error(f"Error appending to table '{table_name}': {e}")
+        return 0
+
 
 def load_from_database(table_name: str) -> pd.DataFrame:
     try:
-        engine = create_engine(DATABASE_URL)
-        df = pd.read_sql_table(table_name, engine)
+        engine = get_engine(DATABASE_URL)
+        df = pd.read_sql_query(text(f"SELECT * FROM {table_name} ORDER BY id"), engine)
+        df = restore_schema(df.drop(columns=INTERNAL_COLUMNS, errors='ignore'))
         logger.info(f"Loaded {len(df)} records from table '{table_name}'")
 
         return df
@@ -102,18 +208,14 @@ def load_latest_data_from_database(table_name: str) -> pd.DataFrame:
     logger.info(f"Carregando dados mais recentes da tabela: {table_name}")
     
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = get_engine(DATABASE_URL)
         
         # Esta query SQL primeiro encontra a data mais recente na tabela
         # e depois seleciona todas as linhas que correspondem a essa data.
-        query = f"""
-            SELECT *
-            FROM {table_name}
-            WHERE extraction_date = (SELECT MAX(extraction_date) FROM {table_name});
-        """
+        query = text(LATEST_QUERY.format(table=table_name))
         
         with engine.connect() as connection:
-            df = pd.read_sql(query, connection)
+            df = restore_schema(pd.read_sql_query(query, connection).drop(columns=INTERNAL_COLUMNS, errors='ignore'))
         
         logger.info(f"✅ {len(df)} linhas carregadas com sucesso da extração mais recente.")
         return df
@@ -122,31 +224,28 @@ def load_latest_data_from_database(table_name: str) -> pd.DataFrame:
         logger.error(f"❌ Erro ao carregar dados do PostgreSQL: {e}")
         return pd.DataFrame() # Retorna um DataFrame vazio em caso de erro
 
-def load_product_history_from_database(table_name: str, base_model: str) -> pd.DataFrame:
+def load_product_history_from_database(table_name: str, product_key: str) -> pd.DataFrame:
     """
     Busca no banco de dados o histórico de preços completo para uma chave de produto normalizada específica.
     """
     try:
         logger = get_logger()
 
-        engine = create_engine(DATABASE_URL)
+        engine = get_engine(DATABASE_URL)
         table_name = table_name.lower()
 
-        query = f"""
-            SELECT extraction_date, cash_price, store
-            FROM {table_name}
-            WHERE base_model = %(model)s
-        """
-        params = {'model': base_model}
+        # A mesma chave em todas as lojas, independente de como cada uma escreve o modelo
+        query = text(HISTORY_QUERY.format(table=table_name))
+        params = {'product_key': product_key}
 
-        logger.info(f"Buscando histórico para o modelo '{base_model}' na tabela '{table_name}'")
+        logger.info(f"Buscando histórico para o modelo '{product_key}' na tabela '{table_name}'")
 
 
         with engine.connect() as connection:
-            df_history = pd.read_sql(query, connection, params=params)
+            df_history = restore_schema(pd.read_sql_query(query, connection, params=params))
             
         return df_history
 
     except Exception as e:
-        print(f"Erro ao buscar histórico do produto {base_model}: {e}")
+        print(f"Erro ao buscar histórico do produto {product_key}: {e}")
         return pd.DataFrame() # Retorna um DataFrame vazio em caso de erro
@@ -1,72 +1,135 @@
-from src.extraction.pichau_scraper import pichau_cpu_scraper, pichau_gpu_scraper
-from src.extraction.kabum_scraper import kabum_scraper
-from src.extraction.terabyte_scraper import terabyte_cpu_scraper, terabyte_gpu_scraper
-from src.transform.transform import transform_raw_data
-from src.load.load import save_to_csv, save_to_database
-from src.config import OUTPUT_PATHS_PROCESSED, OUTPUT_PATHS_RAW
+from src.extraction.engine import scrape_store
+from src.extraction.browser_pool import BrowserPool
+from src.extraction.async_engine import run_async_extraction
+from src.extraction.process_pool import run_sharded_extraction
+from src.extraction.http_extract import scrape_with_fallback
+from src.extraction.jobs import EXTRACTION_JOBS
+from src.extraction.checkpoint import CheckpointJournal
+from src.extraction.stream import iter_job_batches, stream_in_background
+from src.extraction.metrics import METRICS
+from src.extraction.title_parser import default_title_parser
+from src.transform.transform import transform_raw_data, transform_all, split_by_job
+from src.transform.product_key import build_benchmark_index
+from src.load.load import save_to_csv, save_to_database, append_to_csv, append_to_database, database_pool_stats, migrate_database
+from src.config import OUTPUT_PATHS_PROCESSED, OUTPUT_PATHS_RAW, LEAN_MODE, HTTP_FAST_PATH, EXTRACTION_WORKERS
 from src.logger import get_logger
 import pandas as pd
 
-def run_pipeline():
+# Tabela do banco de cada tipo de produto
+PRODUCT_TABLES = {'CPU': 'cpus', 'GPU': 'gpus'}
+
+def run_streaming_pipeline(lean: bool = LEAN_MODE, http_first: bool = HTTP_FAST_PATH, checkpoint: CheckpointJournal = None):
+    """
+    Extração, transformação e carga em micro-lotes: cada página extraída é transformada e
+    acrescentada aos CSVs e ao banco assim que chega, sem montar a listagem inteira na memória.
+    """
+    logger = get_logger()
+    started_files = set()
+    totals = {}
+
+    batches = stream_in_background(lambda: iter_job_batches(lean=lean, http_first=http_first, checkpoint=checkpoint))
+    for key, records in batches:
+        raw_df = pd.DataFrame(records)
+        product_type = records[0]['product_type']
+        raw_path = OUTPUT_PATHS_RAW[f'{key}_raw']
+        append_to_csv(raw_df, raw_path, header=raw_path not in started_files)
+        started_files.add(raw_path)
+
+        df = transform_raw_data(raw_df, product_type, verbose=False)
+        if df.empty:
+            continue
+        processed_path = OUTPUT_PATHS_PROCESSED[key]
+        append_to_csv(df, processed_path, header=processed_path not in started_files)
+        started_files.add(processed_path)
+
+        inserted = append_to_database(df, PRODUCT_TABLES[product_type])
+        rows, stored = totals.get(key, (0, 0))
+        totals[key] = (rows + len(df), stored + inserted)
+        logger.info(f"[{key}] Lote de {len(df)} itens gravado ({inserted} novos no banco).")
+
+    for key, (rows, stored) in totals.items():
+        logger.info(f"[{key}] {rows} itens transformados, {stored} inseridos no banco.")
+    logger.info(f"Cache de títulos: {default_title_parser.stats()}")
+
+
+def run_pipeline(concurrent: bool = False, lean: bool = LEAN_MODE, http_first: bool = HTTP_FAST_PATH,
+                 run_id: str = None, fresh: bool = False, workers: int = EXTRACTION_WORKERS, stream: bool = False):
     logger = get_logger()
     logger.info("Iniciando pipeline ETL...")
 
+    # Páginas já extraídas por uma execução interrompida com o mesmo run id são reaproveitadas
+    checkpoint = CheckpointJournal(run_id)
+    if fresh:
+        checkpoint.clear()
+    METRICS.reset()
+    # Tabelas do banco criadas ou migradas uma única vez, antes de qualquer gravação
+    migrate_database(PRODUCT_TABLES.values())
+    # Índice chave canônica -> benchmark lido pelo dashboard, recriado a cada execução
+    try:
+        build_benchmark_index()
+    except FileNotFoundError as e:
+        logger.warning(f"Índice de benchmarks não atualizado: {e}")
+
+    if stream:
+        logger.info("Executando o pipeline em streaming...")
+        run_streaming_pipeline(lean=lean, http_first=http_first, checkpoint=checkpoint)
+        METRICS.export(run_id=checkpoint.run_id)
+        # O diário só é apagado se nenhuma página ficou faltando
+        checkpoint.clear_if_complete()
+        logger.info(f"Conexões do banco: {database_pool_stats()}")
+        logger.info("Pipeline ETL finalizado.")
+        return
+
     # Extração
-    logger.info("Extraindo dados da Pichau...")
-    pichau_cpu = pd.DataFrame(pichau_cpu_scraper())
-    pichau_gpu = pd.DataFrame(pichau_gpu_scraper())
-
-    logger.info("Extraindo dados da Kabum...")
-    kabum_cpu = pd.DataFrame(kabum_scraper("https://www.kabum.com.br/hardware/processadores","CPU"))
-    kabum_gpu = pd.DataFrame(kabum_scraper("https://www.kabum.com.br/hardware/placa-de-video-vga","GPU"))
-    
-    logger.info("Extraindo dados da Terabyte...")
-    terabyte_cpu = pd.DataFrame(terabyte_cpu_scraper())
-    terabyte_gpu = pd.DataFrame(terabyte_gpu_scraper())
+    if workers != 0:
+        # Cada loja/categoria em um processo próprio; um navegador que trave derruba só o seu trabalho
+        logger.info("Extraindo dados de todas as lojas em processos separados...")
+        results = run_sharded_extraction(workers=workers, lean=lean, http_first=http_first,
+                                         run_id=checkpoint.run_id)
+    elif concurrent:
+        logger.info("Extraindo dados de todas as lojas em modo concorrente...")
+        results = run_async_extraction(lean=lean, checkpoint=checkpoint, http_first=http_first)
+    else:
+        # Um único navegador compartilhado por todos os scrapers (só é aberto se for usado)
+        with BrowserPool(lean=lean) as pool:
+            results = {}
+            for key, store, product_type, url in EXTRACTION_JOBS:
+                logger.info(f"Extraindo dados da {store} ({product_type})...")
+                browser_scraper = lambda: scrape_store(store, product_type, pool, checkpoint, url=url)
+                if http_first:
+                    results[key] = scrape_with_fallback(key, store, product_type, url, browser_scraper)
+                else:
+                    results[key] = browser_scraper()
+
+    # Tempos, contagens e bytes de cada loja/categoria/página (data/metrics)
+    METRICS.export(run_id=checkpoint.run_id)
+
+    raw_frames = {key: pd.DataFrame(results[key]) for key, *_ in EXTRACTION_JOBS}
 
     # Salvar dados brutos
     logger.info("Salvando dados brutos...")
-    save_to_csv(pichau_cpu, OUTPUT_PATHS_RAW['pichau_cpu_raw'])
-    save_to_csv(pichau_gpu, OUTPUT_PATHS_RAW['pichau_gpu_raw'])
+    for key, raw_df in raw_frames.items():
+        save_to_csv(raw_df, OUTPUT_PATHS_RAW[f'{key}_raw'])
 
-    save_to_csv(kabum_cpu, OUTPUT_PATHS_RAW['kabum_cpu_raw'])
-    save_to_csv(kabum_gpu, OUTPUT_PATHS_RAW['kabum_gpu_raw'])
-    
-    save_to_csv(terabyte_cpu, OUTPUT_PATHS_RAW['terabyte_cpu_raw'])
-    save_to_csv(terabyte_gpu, OUTPUT_PATHS_RAW['terabyte_gpu_raw'])
-
-
-    # Transformação
+    # Transformação: todas as lojas/categorias em uma única passada, separadas só na gravação
     logger.info("Transformando dados...")
-    pichau_cpu_t = transform_raw_data(pichau_cpu)
-    pichau_gpu_t = transform_raw_data(pichau_gpu)
-
-    kabum_cpu_t = transform_raw_data(kabum_cpu)
-    kabum_gpu_t = transform_raw_data(kabum_gpu)
-
-    terabyte_cpu_t = transform_raw_data(terabyte_cpu)
-    terabyte_gpu_t = transform_raw_data(terabyte_gpu)
+    transformed = transform_all(raw_frames)
+    logger.info(f"Cache de títulos: {default_title_parser.stats()}")
 
     # Salvar dados transformados
     logger.info("Salvando dados transformados...")
-    save_to_csv(pichau_cpu_t, OUTPUT_PATHS_PROCESSED['pichau_cpu'])
-    save_to_csv(pichau_gpu_t, OUTPUT_PATHS_PROCESSED['pichau_gpu'])
-
-    save_to_csv(kabum_cpu_t, OUTPUT_PATHS_PROCESSED['kabum_cpu'])
-    save_to_csv(kabum_gpu_t, OUTPUT_PATHS_PROCESSED['kabum_gpu'])
-
-    save_to_csv(terabyte_cpu_t, OUTPUT_PATHS_PROCESSED['terabyte_cpu'])
-    save_to_csv(terabyte_gpu_t, OUTPUT_PATHS_PROCESSED['terabyte_gpu'])
+    for df in transformed.values():
+        for key, part in split_by_job(df).items():
+            save_to_csv(part, OUTPUT_PATHS_PROCESSED[key])
 
-    # Persistir dados no Banco de Dados
+    # Persistir dados no Banco de Dados: uma gravação por tabela, com todas as lojas
     logger.info("Salvando dados no Banco de Dados...")
-    save_to_database(pichau_cpu_t, 'cpus')
-    save_to_database(pichau_gpu_t, 'gpus')
-
-    save_to_database(kabum_cpu_t, 'cpus')
-    save_to_database(kabum_gpu_t, 'gpus')
-
-    save_to_database(terabyte_cpu_t, 'cpus')
-    save_to_database(terabyte_gpu_t, 'gpus')
-
+    for product_type, df in transformed.items():
+        save_to_database(df, PRODUCT_TABLES[product_type])
+
+    # Execução concluída: o diário de páginas só é apagado se nenhuma página ficou faltando;
+    # senão, rodar de novo com o mesmo run id busca só as que faltam
+    checkpoint.clear_if_complete()
+    # Todas as gravações usam o mesmo pool de conexões (ver src/load/db_engine.py)
+    logger.info(f"Conexões do banco: {database_pool_stats()}")
     logger.info("Pipeline ETL finalizado.") 
\ No newline at end of file
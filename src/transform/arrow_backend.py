@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.transform.price_columns import (
+    INSTALLMENT_COUNT_PATTERN,
+    INSTALLMENT_PRICE_PATTERN,
+    NUMBER_PATTERN,
+    _has_text,
+    _to_float,
+    parse_installments as parse_installments_pandas,
+)
+
+# Os mesmos passos de price_columns.py com o pyarrow.compute (colunar, em C++ e com várias
+# threads). Os resultados são idênticos aos do backend pandas; as expressões regulares do
+# Arrow (RE2) recebem os \s e \d do Python (Unicode) escritos por extenso.
+# WHITESPACE são os caracteres com str.isspace() (o \s do Python), escritos aqui para não
+# percorrer toda a tabela Unicode na importação
+WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+    "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+SPACE_CLASS = "[" + "".join(f"\\x{{{ord(c):x}}}" for c in WHITESPACE) + "]"
+ASCII_SPACE_CLASS = "[" + "".join(f"\\x{{{ord(c):x}}}" for c in WHITESPACE if c.isascii()) + "]"
+
+
+def _re2(pattern: str, ascii_only: bool) -> str:
+    """Versão RE2 de um padrão de um grupo, nomeado "value"; em textos só ASCII os dígitos são [0-9], bem mais rápido."""
+    if ascii_only:
+        pattern = pattern.replace(r"\s", ASCII_SPACE_CLASS).replace(r"[\d", "[0-9").replace(r"\d", "[0-9]")
+    pattern = pattern.replace(r"\s", SPACE_CLASS).replace(r"\d", r"\p{Nd}")
+    return "(?is)" + pattern.replace("(", "(?P<value>", 1)
+
+
+NUMBER_RE2 = f"^(?:{NUMBER_PATTERN})$"
+COUNT_RE2 = {ascii_only: _re2(INSTALLMENT_COUNT_PATTERN, ascii_only) for ascii_only in (True, False)}
+PRICE_RE2 = {ascii_only: _re2(INSTALLMENT_PRICE_PATTERN, ascii_only) for ascii_only in (True, False)}
+NULL_TEXT = pa.scalar(None, pa.string())
+
+
+def _to_strings(values: pd.Series) -> tuple:
+    """
+    Coluna como pa.string(); o que não é texto vira nulo, como no acessor .str. Devolve
+    também a máscara dos valores não nulos que não são texto (None se não houver nenhum).
+    """
+    try:
+        texts = pa.array(values, type=pa.string(), from_pandas=True)
+        # Colunas de texto que já são Arrow no pandas chegam em pedaços
+        return (texts.combine_chunks() if isinstance(texts, pa.ChunkedArray) else texts), None
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        is_text = values.map(lambda value: isinstance(value, str)).astype(bool)
+        texts = pa.array(values.where(is_text), type=pa.string(), from_pandas=True)
+        return texts, ~is_text & values.notna()
+
+
+def _to_series(values: pa.Array, index: pd.Index) -> pd.Series:
+    return pd.Series(values.to_numpy(zero_copy_only=False), index=index, dtype="float64")
+
+
+def _per_unique(texts: pa.Array, func) -> tuple:
+    """Aplica `func` ao dicionário de valores distintos e espalha o(s) resultado(s) para todas as linhas."""
+    encoded = pc.dictionary_encode(texts)
+    parsed = func(encoded.dictionary)
+    return tuple(pc.take(values, encoded.indices) for values in parsed)
+
+
+def _parse_numbers(texts: pa.Array) -> pa.Array:
+    """float() de cada texto: números simples com o cast do Arrow, o resto um a um pelo float()."""
+    simple = pc.fill_null(pc.match_substring_regex(texts, NUMBER_RE2), False)
+    parsed = pc.cast(pc.if_else(simple, texts, NULL_TEXT), pa.float64())
+    leftover = pc.and_(pc.invert(simple), pc.is_valid(texts))
+    if not pc.any(leftover).as_py():
+        return parsed
+    values = parsed.to_numpy(zero_copy_only=False, writable=True)
+    positions = np.flatnonzero(leftover.to_numpy(zero_copy_only=False))
+    values[positions] = [_to_float(text) for text in pc.take(texts, positions).to_pylist()]
+    return pa.array(values, type=pa.float64(), from_pandas=True)
+
+
+def _parse_price_values(prices: pa.Array) -> pa.Array:
+    cleaned = pc.replace_substring(prices, "R$", "")
+    cleaned = pc.utf8_trim(cleaned, characters=WHITESPACE)
+    cleaned = pc.replace_substring(pc.replace_substring(cleaned, ".", ""), ",", ".")
+    return _parse_numbers(cleaned)
+
+
+def _extract_group(texts: pa.Array, pattern: str) -> pa.Array:
+    extracted = pc.extract_regex(texts, pattern)
+    return pc.if_else(pc.is_valid(extracted), pc.struct_field(extracted, [0]), NULL_TEXT)
+
+
+def _extract_first(texts: pa.Array, patterns: dict) -> pa.Array:
+    """O grupo do padrão em cada texto (ou nulo); só os textos fora do ASCII (ex: com espaço não separável) usam as classes Unicode."""
+    extracted = _extract_group(texts, patterns[True])
+    non_ascii = pc.invert(pc.fill_null(pc.string_is_ascii(texts), True))
+    if pc.any(non_ascii).as_py():
+        extracted = pc.replace_with_mask(extracted, non_ascii, _extract_group(texts.filter(non_ascii), patterns[False]))
+    return extracted
+
+
+def _parse_installment_texts(texts: pa.Array) -> tuple:
+    plain = pc.fill_null(pc.match_substring_regex(texts, NUMBER_RE2), False)
+    count = _parse_numbers(pc.if_else(plain, texts, _extract_first(texts, COUNT_RE2)))
+    price = _parse_price_values(pc.if_else(plain, NULL_TEXT, _extract_first(texts, PRICE_RE2)))
+    return count, price
+
+
+def parse_price(prices: pd.Series) -> pd.Series:
+    """Mesmo resultado de price_columns.parse_price."""
+    if not _has_text(prices):
+        return pd.Series(np.nan, index=prices.index, dtype="float64")
+    texts, _ = _to_strings(prices)
+    (parsed,) = _per_unique(texts, lambda uniques: (_parse_price_values(uniques),))
+    return _to_series(parsed, prices.index)
+
+
+def parse_installments(installments: pd.Series, installment_prices: pd.Series) -> tuple:
+    """
+    Mesmo resultado de price_columns.parse_installments. Os textos da coluna de parcelas
+    passam pelo Arrow; números e a coluna de valores (numérica na gravação dos scrapers)
+    seguem pelo caminho do pandas.
+    """
+    if not _has_text(installments):
+        return parse_installments_pandas(installments, installment_prices)
+
+    texts, non_text = _to_strings(installments)
+    count, embedded_price = (_to_series(values, installments.index) for values in _per_unique(texts, _parse_installment_texts))
+    if non_text is not None:
+        # Números gravados pelos scrapers misturados aos textos
+        count[non_text] = pd.to_numeric(installments[non_text], errors="coerce")
+
+    empty = pd.Series(np.nan, index=installments.index, dtype="float64")
+    _, price = parse_installments_pandas(empty, installment_prices)
+    return count.round().astype("Int64"), price.fillna(embedded_price)
+
+
+def add_price_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza cash_price, installments e installment_price do DataFrame (altera e devolve `df`)."""
+    df["cash_price"] = parse_price(df["cash_price"])
+    df["installments"], df["installment_price"] = parse_installments(df["installments"], df["installment_price"])
+    return df
+
+
+def _keys(values: pd.Series) -> pa.Array:
+    # Categorias e object viram texto; chaves que não são texto não casam com nada
+    return _to_strings(values.astype(object))[0]
+
+
+def join_on_key(left: pd.DataFrame, right: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Junção interna com `right` de chaves únicas (ex: o índice de benchmarks), na ordem de `left`."""
+    right_keys = _keys(right[key])
+    if pc.count_distinct(right_keys, mode="all").as_py() != len(right_keys):
+        raise ValueError(f"Chaves repetidas em '{key}' no lado direito da junção")
+    positions = pc.index_in(_keys(left[key]), value_set=right_keys)
+    matched = pc.is_valid(positions)
+    left_rows = np.flatnonzero(matched.to_numpy(zero_copy_only=False))
+    right_rows = positions.filter(matched).to_numpy(zero_copy_only=False)
+    return pd.concat([
+        left.iloc[left_rows].reset_index(drop=True),
+        right.drop(columns=[key]).iloc[right_rows].reset_index(drop=True),
+    ], axis=1)
+
+
+def cheapest_per_key(df: pd.DataFrame, key: str, value: str) -> pd.DataFrame:
+    """A linha de menor `value` de cada `key` (a primeira, em empates), ordenadas pela chave."""
+    if df.empty:
+        return df
+    encoded = pc.dictionary_encode(_keys(df[key]))
+    table = pa.table({
+        # Cada chave como a sua posição na ordem alfabética, para ordenar os grupos no fim
+        "key": pc.take(pc.rank(encoded.dictionary, sort_keys="ascending"), encoded.indices),
+        "value": pa.array(df[value].to_numpy(dtype="float64", na_value=np.nan)),
+        "row": pa.array(np.arange(len(df))),
+    }).filter(pc.is_valid(encoded.indices))
+
+    # Menor valor de cada chave e, entre as linhas com esse valor, a primeira (como o idxmin)
+    minimum = table.group_by("key").aggregate([("value", "min")])
+    group_minimum = pc.take(minimum["value_min"], pc.index_in(table["key"], value_set=minimum["key"]))
+    cheapest = table.filter(pc.equal(table["value"], group_minimum))
+    first = cheapest.group_by("key").aggregate([("row", "min")]).sort_by("key")
+    return df.iloc[first["row_min"].to_numpy()]
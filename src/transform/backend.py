@@ -0,0 +1,42 @@
+import pandas as pd
+
+from src.config import DATAFRAME_BACKEND
+from src.transform import price_columns
+
+# "pandas": as funções de price_columns.py e merge/groupby do pandas;
+# "arrow": os mesmos passos com o pyarrow.compute (ver arrow_backend.py), com resultados idênticos
+BACKENDS = ("pandas", "arrow")
+
+
+def _arrow_backend(backend: str):
+    """O módulo do backend colunar, ou None para o pandas (o pyarrow só é importado se for usado)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de DataFrame desconhecido: {backend} (opções: {', '.join(BACKENDS)})")
+    if backend == "pandas":
+        return None
+    from src.transform import arrow_backend
+    return arrow_backend
+
+
+def add_price_columns(df: pd.DataFrame, backend: str = DATAFRAME_BACKEND) -> pd.DataFrame:
+    """Normaliza as colunas de preço e parcelas (altera e devolve `df`)."""
+    arrow = _arrow_backend(backend)
+    return arrow.add_price_columns(df) if arrow else price_columns.add_price_columns(df)
+
+
+def join_on_key(left: pd.DataFrame, right: pd.DataFrame, key: str, backend: str = DATAFRAME_BACKEND) -> pd.DataFrame:
+    """Junção interna pela coluna `key`, com chaves únicas em `right` (ex: o índice de benchmarks)."""
+    arrow = _arrow_backend(backend)
+    if arrow:
+        return arrow.join_on_key(left, right, key)
+    return pd.merge(left, right, on=key, how='inner', validate='many_to_one')
+
+
+def cheapest_per_key(df: pd.DataFrame, key: str, value: str, backend: str = DATAFRAME_BACKEND) -> pd.DataFrame:
+    """A linha de menor `value` de cada `key`, ordenadas pela chave (o groupby + idxmin do dashboard)."""
+    arrow = _arrow_backend(backend)
+    if arrow:
+        return arrow.cheapest_per_key(df, key, value)
+    if df.empty:
+        return df
+    return df.loc[df.groupby(key)[value].idxmin()]
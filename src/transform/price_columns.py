@@ -0,0 +1,129 @@
+import pandas as pd
+import numpy as np
+
+# Parcelas ("12x") e valor no formato de scraper_utils.INSTALLMENT_PATTERN ("10x de R$ 59,78")
+INSTALLMENT_COUNT_PATTERN = r"(\d+)\s*x"
+INSTALLMENT_PRICE_PATTERN = r"\d+\s*x\s*de\s*R\$\s*([\d.,]+)"
+# Números que o astype("float64") converte exatamente como o float() do Python
+NUMBER_PATTERN = r"[+-]?[0-9]+(?:\.[0-9]*)?"
+# Resultados de pandas.api.types.infer_dtype para colunas com pelo menos um texto
+TEXT_DTYPES = ("string", "mixed", "mixed-integer")
+
+
+def _has_text(values: pd.Series) -> bool:
+    """Se a coluna tem algum texto (o acessor .str recusa colunas object só com números)."""
+    return not values.empty and pd.api.types.infer_dtype(values, skipna=True) in TEXT_DTYPES
+
+
+def _per_unique(values: pd.Series, func):
+    """
+    Aplica `func` só aos valores distintos da coluna e espalha o resultado (Series ou
+    DataFrame) de volta para todas as linhas. Preços e textos de parcelamento se repetem
+    muito entre produtos e entre dias de coleta.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = func(pd.Series(uniques))
+    # Uma linha vazia no fim: o código -1 (valor nulo) aponta para ela
+    if isinstance(parsed, pd.DataFrame):
+        padded = np.vstack([parsed.to_numpy(dtype="float64", na_value=np.nan), np.full((1, parsed.shape[1]), np.nan)])
+        return pd.DataFrame(padded[codes], index=values.index, columns=parsed.columns)
+    padded = np.append(parsed.to_numpy(dtype="float64", na_value=np.nan), np.nan)
+    return pd.Series(padded[codes], index=values.index, dtype="float64")
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _parse_numbers(texts: pd.Series) -> pd.Series:
+    """
+    float() de cada texto, vetorizado: os números simples são convertidos de uma vez e o
+    que sobrar (ex: "N/A", "1e3", "1_000") passa um a um pelo próprio float().
+    """
+    simple = texts.str.fullmatch(NUMBER_PATTERN).fillna(False).astype(bool)
+    parsed = pd.Series(np.nan, index=texts.index, dtype="float64")
+    parsed[simple] = texts[simple].astype("float64")
+    leftover = ~simple & texts.notna()
+    if leftover.any():
+        parsed[leftover] = texts[leftover].map(_to_float)
+    return parsed
+
+
+def _parse_price_values(prices: pd.Series) -> pd.Series:
+    # Mesmos passos de clean_price; o acessor .str devolve NaN para o que não é texto
+    cleaned = (
+        prices.str.replace("R$", "", regex=False)
+        .str.strip()
+        .str.replace(".", "", regex=False)
+        .str.replace(",", ".", regex=False)
+    )
+    return _parse_numbers(cleaned)
+
+
+def _extract_first(texts: pd.Series, pattern: str) -> pd.Series:
+    """
+    O mesmo que texts.str.extract(pattern) para um único grupo (primeira ocorrência, sem
+    diferenciar maiúsculas), feito com um replace, bem mais rápido que o extract no pandas.
+    O padrão sempre consome mais que o grupo, então texto inalterado = nenhuma ocorrência.
+    """
+    replaced = texts.str.replace(f"(?is)^.*?{pattern}.*$", r"\1", regex=True)
+    return replaced.where(replaced.ne(texts).fillna(False).astype(bool))
+
+
+def _parse_installment_texts(texts: pd.Series) -> pd.DataFrame:
+    """Parcelas e valor de textos como "10x de R$ 59,78" (ou só "12x"); números puros ficam como estão."""
+    is_text = texts.str.len().notna()
+    plain = texts.str.fullmatch(NUMBER_PATTERN).fillna(False).astype(bool)
+    count = pd.Series(np.nan, index=texts.index, dtype="float64")
+    # Números gravados pelos scrapers misturados aos textos, e textos que já são números
+    count[~is_text] = pd.to_numeric(texts[~is_text], errors="coerce")
+    count[plain] = texts[plain].astype("float64")
+    rest = texts[is_text & ~plain]
+    count[rest.index] = _parse_numbers(_extract_first(rest, INSTALLMENT_COUNT_PATTERN))
+    price = _parse_price_values(_extract_first(rest, INSTALLMENT_PRICE_PATTERN)).reindex(texts.index)
+    return pd.DataFrame({"installments": count, "installment_price": price})
+
+
+def parse_price(prices: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de transform.clean_price: "R$ 1.234,56" -> 1234.56; textos sem
+    número ("N/A") e valores que não são texto viram NaN.
+    """
+    if not _has_text(prices):
+        # clean_price só aceita texto
+        return pd.Series(np.nan, index=prices.index, dtype="float64")
+    return _per_unique(prices, _parse_price_values)
+
+
+def parse_installments(installments: pd.Series, installment_prices: pd.Series) -> tuple:
+    """
+    Número de parcelas (Int64) e valor da parcela (float) a partir das colunas brutas.
+    Valores numéricos (o que os scrapers gravam) são convertidos com to_numeric, como antes;
+    os textos das lojas também são aceitos: "10x de R$ 59,78" na coluna de parcelas (o valor
+    preenche a outra coluna se ela estiver vazia), "12x" e "R$ 74,01" separados, ou "N/A".
+    """
+    embedded_price = None
+    if _has_text(installments):
+        parsed = _per_unique(installments, _parse_installment_texts)
+        count, embedded_price = parsed["installments"], parsed["installment_price"]
+    else:
+        count = pd.to_numeric(installments, errors="coerce").astype("float64")
+
+    if _has_text(installment_prices):
+        price = _per_unique(installment_prices, lambda texts: pd.to_numeric(texts, errors="coerce")
+                            .astype("float64").fillna(_parse_price_values(texts)))
+    else:
+        price = pd.to_numeric(installment_prices, errors="coerce").astype("float64")
+    if embedded_price is not None:
+        price = price.fillna(embedded_price)
+    return count.round().astype("Int64"), price
+
+
+def add_price_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza cash_price, installments e installment_price do DataFrame (altera e devolve `df`)."""
+    df["cash_price"] = parse_price(df["cash_price"])
+    df["installments"], df["installment_price"] = parse_installments(df["installments"], df["installment_price"])
+    return df
@@ -0,0 +1,99 @@
+import re
+import os
+
+import pandas as pd
+
+from src.config import BENCHMARK_SOURCES, BENCHMARK_INDEX_PATH
+from src.logger import get_logger
+
+logger = get_logger()
+
+# Colunas do produto que formam a chave canônica de cada categoria
+KEY_COLUMNS = {"CPU": ["variant", "base_model"], "GPU": ["base_model"]}
+
+
+def normalize_cpu_name(name: str) -> str:
+    """Nome de CPU sem marca/família, sem sufixo F/KF e com as palavras ordenadas: "Core i5-12400F" -> "12400 i5"."""
+    if not isinstance(name, str):
+        return ""
+    n = name.lower()
+    n = re.sub(r'\b(amd|intel|core|ryzen|ultra)\b', '', n)
+    n = n.replace('-', ' ')
+
+    n = re.sub(r'(\d+k)f$', r'\1', n)  # Trata o caso 'KF' -> 'K'
+    n = re.sub(r'(\d+)f$', r'\1', n)   # Trata o caso 'F' -> ''
+
+    n = re.sub(r'[^a-z0-9\s]', '', n)
+    return " ".join(sorted(n.split()))
+
+
+def normalize_gpu_name(name: str) -> str:
+    """Nome de GPU em minúsculas, sem pontuação e com as palavras ordenadas: "RTX 4060 Ti" -> "4060 rtx ti"."""
+    if not isinstance(name, str):
+        return ""
+    n = name.lower()
+    n = n.replace('-', ' ')
+    n = re.sub(r'[^a-z0-9\s]', '', n)
+    return " ".join(sorted(n.split()))
+
+
+NORMALIZERS = {"CPU": normalize_cpu_name, "GPU": normalize_gpu_name}
+
+
+def _normalize_unique(names: pd.Series, product_type: str) -> pd.Series:
+    """Normaliza só os nomes distintos (poucas centenas de modelos) e espalha para todas as linhas."""
+    codes, uniques = pd.factorize(names)
+    normalizer = NORMALIZERS[product_type]
+    keys = [normalizer(name) or None for name in uniques] + [None]
+    return pd.Series([keys[code] for code in codes], index=names.index, dtype=object)
+
+
+def product_keys(df: pd.DataFrame, product_type: str) -> pd.Series:
+    """
+    Chave canônica de cada produto (ex: "5600 5" para um Ryzen 5 5600), a mesma usada no
+    índice de benchmarks. Produtos sem modelo reconhecido ficam sem chave (None).
+    """
+    columns = KEY_COLUMNS[product_type]
+    names = df[columns[0]].astype(object)
+    for column in columns[1:]:
+        # Com qualquer parte faltando o nome fica nulo, como na concatenação de textos
+        names = names + ' ' + df[column].astype(object)
+    return _normalize_unique(names, product_type)
+
+
+def add_product_key(df: pd.DataFrame, product_type: str) -> pd.DataFrame:
+    """Acrescenta a coluna product_key ao DataFrame (altera e devolve `df`)."""
+    df["product_key"] = product_keys(df, product_type)
+    return df
+
+
+def build_benchmark_index(path: str = BENCHMARK_INDEX_PATH) -> pd.DataFrame:
+    """
+    Lê os CSVs de benchmark (BENCHMARK_SOURCES), calcula a chave de cada modelo e grava o
+    índice chave -> benchmark em `path`. Nomes que resultam na mesma chave ficam com a
+    primeira linha, para que a junção com os produtos não duplique ofertas.
+    """
+    frames = []
+    for product_type, (source, name_column) in BENCHMARK_SOURCES.items():
+        benchmarks = pd.read_csv(source)
+        frames.append(pd.DataFrame({
+            "product_type": product_type,
+            "product_key": _normalize_unique(benchmarks[name_column], product_type),
+            "model": benchmarks[name_column],
+            "score": benchmarks["Pontuação"],
+        }))
+    index = pd.concat(frames, ignore_index=True).dropna(subset=["product_key"])
+    index = index.drop_duplicates(subset=["product_type", "product_key"])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index.to_csv(path, index=False)
+    logger.info(f"Índice de benchmarks gravado em {path} ({len(index)} modelos)")
+    return index
+
+
+def load_benchmark_index(product_type: str, path: str = BENCHMARK_INDEX_PATH) -> pd.DataFrame:
+    """Índice chave -> benchmark de uma categoria; é recriado se não existir ou se algum CSV de benchmark for mais novo."""
+    sources = [source for source, _ in BENCHMARK_SOURCES.values()]
+    stale = not os.path.exists(path) or any(os.path.getmtime(s) > os.path.getmtime(path) for s in sources)
+    index = build_benchmark_index(path) if stale else pd.read_csv(path, dtype={"product_key": str, "model": str})
+    return index[index["product_type"] == product_type].drop(columns=["product_type"]).reset_index(drop=True)
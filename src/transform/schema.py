@@ -0,0 +1,65 @@
+import pandas as pd
+
+# Tipos das colunas dos DataFrames processados (CPUs e GPUs). Colunas de poucos valores
+# distintos (algumas centenas de modelos, mesmo em um ano de coletas) viram categorias, preços float32 (exatos até centavos abaixo de R$ 131 mil),
+# parcelas inteiros pequenos e a data de extração uma data de verdade (datetime64, sem hora).
+PROCESSED_SCHEMA = {
+    "brand": "category",
+    "base_model": "category",
+    "socket": "category",
+    "variant": "category",
+    "manufacturer": "category",
+    "vram_memory": "category",
+    "store": "category",
+    "product_key": "category",
+    "cash_price": "float32",
+    "installments": "Int16",
+    "installment_price": "float32",
+    "extraction_date": "date",
+}
+
+PRICE_COLUMNS = [column for column, dtype in PROCESSED_SCHEMA.items() if dtype == "float32"]
+CATEGORY_COLUMNS = [column for column, dtype in PROCESSED_SCHEMA.items() if dtype == "category"]
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas presentes em `df` para PROCESSED_SCHEMA (devolve uma cópia)."""
+    df = df.copy()
+    for column, dtype in PROCESSED_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        if dtype == "date":
+            df[column] = pd.to_datetime(df[column], errors="coerce").dt.normalize()
+        elif dtype == "category":
+            # Categorias sempre de texto, mesmo vindas de um CSV com números (ex: vram_memory)
+            values = df[column]
+            df[column] = values.where(values.isna(), values.astype(str)).astype("category")
+        elif dtype == "Int16":
+            df[column] = pd.to_numeric(df[column], errors="coerce").round().astype("Int16")
+        else:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+    return df
+
+
+# Ao carregar (banco ou CSV) os dados voltam ao mesmo formato compacto
+restore_schema = apply_schema
+
+
+def to_storage(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versão para gravar no banco: preços voltam a float64 arredondados em centavos (o float32
+    viraria REAL e 1299.9 seria gravado como 1299.9000244), data como date.
+    """
+    df = df.copy()
+    for column in PRICE_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("float64").round(2)
+    if "extraction_date" in df.columns:
+        df["extraction_date"] = pd.to_datetime(df["extraction_date"], errors="coerce").dt.date
+    return df
+
+
+def read_processed_csv(path: str) -> pd.DataFrame:
+    """Lê um CSV processado já com os tipos de PROCESSED_SCHEMA."""
+    # Lidas como texto: o leitor transformaria, por exemplo, socket "1700" em número
+    return restore_schema(pd.read_csv(path, dtype={column: str for column in CATEGORY_COLUMNS}))
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from src.extraction.title_parser import TitleParser, default_title_parser
+
+# Colunas de saída de cada categoria, na ordem gravada nos CSVs processados
+CPU_COLUMNS = ["brand", "socket", "base_model", "variant", "cash_price", "installments",
+               "installment_price", "full_title", "link", "store"]
+GPU_COLUMNS = ["brand", "manufacturer", "base_model", "custom_model", "vram_memory", "cash_price",
+               "installments", "installment_price", "full_title", "store", "link"]
+
+# Campo do TitleParser que vira cada coluna derivada, por categoria
+TITLE_FIELDS = {
+    "CPU": {"brand": "brand", "socket": "socket", "base_model": "cpu_base_model", "variant": "cpu_variant"},
+    "GPU": {"brand": "brand", "manufacturer": "manufacturer", "base_model": "gpu_base_model",
+            "custom_model": "gpu_custom_model", "vram_memory": "vram_memory"},
+}
+
+
+def parse_titles(titles: pd.Series, fields: dict, parser: TitleParser = default_title_parser) -> pd.DataFrame:
+    """
+    Colunas `fields` ({coluna: campo do parser}) de cada título. Cada título distinto é
+    analisado uma vez (e os já vistos em lotes anteriores vêm do cache LRU do parser).
+    """
+    unique = pd.unique(titles)
+    parsed = [parser.parse(title) for title in unique]
+    table = pd.DataFrame({column: [result[field] for result in parsed] for column, field in fields.items()},
+                         index=unique)
+    return table.reindex(titles.to_numpy()).set_axis(titles.index)
+
+
+def add_title_columns(df: pd.DataFrame, product_type: str) -> pd.DataFrame:
+    """
+    Deriva marca, socket, modelo, variante, fabricante e memória a partir de `full_title`
+    com o TitleParser (um parse por título distinto) e devolve as colunas na ordem da categoria.
+    Colunas derivadas já existentes (CSVs brutos antigos) são recalculadas.
+    """
+    if product_type not in TITLE_FIELDS:
+        raise ValueError(f"Tipo de produto desconhecido: {product_type}")
+    df = df.copy()
+    titles = df["full_title"].fillna("N/A").astype(str)
+    for column, values in parse_titles(titles, TITLE_FIELDS[product_type]).items():
+        df[column] = values
+    columns = CPU_COLUMNS if product_type == "CPU" else GPU_COLUMNS
+
+    ordered = [c for c in columns if c in df.columns]
+    extra = [c for c in df.columns if c not in columns and c != "product_type"]
+    return df[ordered + extra]
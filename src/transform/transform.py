@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
 
+from src.transform.title_columns import add_title_columns
+from src.transform.backend import add_price_columns
+from src.transform.schema import apply_schema
+from src.transform.product_key import add_product_key
+from src.config import DATAFRAME_BACKEND
+
 
 def clean_price(price_str: str) -> float:
     if not isinstance(price_str, str):
@@ -12,35 +18,108 @@ def clean_price(price_str: str) -> float:
     except (ValueError, AttributeError):
         return np.nan
 
-def transform_raw_data(raw_df: pd.DataFrame) -> pd.DataFrame:
+def infer_product_type(df: pd.DataFrame) -> str:
+    """Categoria do DataFrame: coluna `product_type` dos registros brutos ou, em CSVs antigos, as colunas derivadas."""
+    if "product_type" in df.columns:
+        product_types = df["product_type"].dropna().unique()
+        if len(product_types) != 1:
+            raise ValueError(f"Esperado um único tipo de produto, encontrados: {list(product_types)}")
+        return product_types[0]
+    return "GPU" if "vram_memory" in df.columns else "CPU"
+
+def transform_raw_data(raw_df: pd.DataFrame, product_type: str = None, verbose: bool = True,
+                       backend: str = DATAFRAME_BACKEND) -> pd.DataFrame:
+    # Em micro-lotes (pipeline em streaming) as mensagens de progresso seriam repetidas a cada lote
+    log = print if verbose else (lambda *args: None)
     if raw_df.empty:
-        print("DataFrame vazio. Nenhum dado será transformado.")
+        log("DataFrame vazio. Nenhum dado será transformado.")
         return pd.DataFrame()
     
-    df = raw_df.copy()
+    log("Iniciando transformação: Extraindo campos dos títulos...")
+
+    # 0. Deriva marca, modelo, variante etc. dos títulos, de uma vez para todo o DataFrame
+    product_type = product_type or infer_product_type(raw_df)
+    df = add_title_columns(raw_df, product_type)
+    # Chave canônica do modelo, a mesma do índice de benchmarks (ver product_key.py)
+    df = add_product_key(df, product_type)
     
-    print("Iniciando transformação: Normalizando colunas numéricas...")
+    log("Normalizando colunas numéricas...")
 
-    # 1. Normaliza as colunas de preço e parcelas para o formato numérico
-    df['cash_price'] = df['cash_price'].apply(clean_price)
-    df['installments'] = pd.to_numeric(df['installments'], errors='coerce')
-    df['installment_price'] = pd.to_numeric(df['installment_price'], errors='coerce')
+    # 1. Normaliza as colunas de preço e parcelas para o formato numérico (colunas inteiras, ver price_columns.py;
+    # com backend="arrow" os mesmos passos rodam no pyarrow.compute, ver backend.py)
+    df = add_price_columns(df, backend)
 
-    print(f"Encontrados {len(df)} itens brutos. Descartando itens sem estoque (sem preço)...")
+    log(f"Encontrados {len(df)} itens brutos. Descartando itens sem estoque (sem preço)...")
     # 2. Descarta os itens sem preço à vista (considerados fora de estoque)
     # .dropna() remove as linhas onde o valor na coluna 'cash_price' é Nulo/NaN, pois significa que o item não está em estoque
     df.dropna(subset=['cash_price'], inplace=True)
-    print(f"Restaram {len(df)} itens em estoque.")
+    log(f"Restaram {len(df)} itens em estoque.")
 
     # Se não sobrar nenhum item após o filtro, retorna um DataFrame vazio para evitar erros
     if df.empty:
         return pd.DataFrame()
     
-    # 4. Garante que os tipos de dados estejam corretos (ex: Int64 para parcelas, que lida com nulos)
-    df['installments'] = df['installments'].astype('Int64')
+    # 4. Adiciona uma coluna com a data de extração
+    df['extraction_date'] = pd.Timestamp.today().normalize()
+
+    # 5. Tipos compactos (categorias, float32, inteiros pequenos, data), ver schema.py
+    df = apply_schema(df)
+
+    log("Transformação concluída.")
+    return df
+
+
+def transform_all(raw_frames: dict, verbose: bool = True, backend: str = DATAFRAME_BACKEND) -> dict:
+    """
+    Transforma de uma vez os DataFrames brutos de todas as lojas/categorias ({chave: DataFrame},
+    como em EXTRACTION_JOBS). Os registros são concatenados e normalizados em uma única passada
+    e só são separados na gravação: devolve {tipo de produto: DataFrame}, com a chave de cada
+    registro no nível "job" do índice (ver split_by_job).
+    """
+    log = print if verbose else (lambda *args: None)
+    frames = {key: df for key, df in raw_frames.items() if not df.empty}
+    if not frames:
+        log("DataFrames vazios. Nenhum dado será transformado.")
+        return {}
+
+    keys_by_type = {}
+    for key, df in frames.items():
+        keys_by_type.setdefault(infer_product_type(df), []).append(key)
+
+    log(f"Iniciando transformação unificada de {sum(len(df) for df in frames.values())} itens "
+        f"({len(frames)} lojas/categorias): Extraindo campos dos títulos...")
+
+    # 0. Os campos dos títulos dependem da categoria: um passo por tipo de produto, não por loja
+    titled, columns_by_type = [], {}
+    for product_type, keys in keys_by_type.items():
+        raw = pd.concat([frames[key] for key in keys], keys=keys, names=["job", None])
+        df = add_product_key(add_title_columns(raw, product_type), product_type)
+        columns_by_type[product_type] = list(df.columns)
+        titled.append(df)
+    df = pd.concat(titled) if len(titled) > 1 else titled[0]
+
+    log("Normalizando colunas numéricas...")
+    # 1-2. Preços, parcelas e o descarte dos itens sem estoque para todos os registros de uma vez
+    df = add_price_columns(df, backend)
+    log(f"Encontrados {len(df)} itens brutos. Descartando itens sem estoque (sem preço)...")
+    df.dropna(subset=['cash_price'], inplace=True)
+    log(f"Restaram {len(df)} itens em estoque.")
+
+    df['extraction_date'] = pd.Timestamp.today().normalize()
+    df = apply_schema(df)
+
+    # Cada tipo de produto volta às suas colunas (a concatenação junta as de CPU e GPU)
+    job_types = df.index.get_level_values("job").map({key: t for t, keys in keys_by_type.items() for key in keys})
+    transformed = {}
+    for product_type, columns in columns_by_type.items():
+        part = df.loc[job_types == product_type, columns + ['extraction_date']]
+        if not part.empty:
+            transformed[product_type] = part
+
+    log("Transformação concluída.")
+    return transformed
 
-    # 5. Adiciona uma coluna com a data de extração
-    df['extraction_date'] = pd.to_datetime('today').strftime('%Y-%m-%d')
 
-    print("Transformação concluída.")
-    return df
\ No newline at end of file
+def split_by_job(df: pd.DataFrame) -> dict:
+    """Separa um DataFrame de transform_all em {chave: DataFrame} com o índice original de cada loja/categoria."""
+    return {key: part.droplevel("job") for key, part in df.groupby(level="job", sort=False)}